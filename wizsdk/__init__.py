@@ -1,4 +1,4 @@
-from .client import Client, unregister_all, register_clients
+from .client import Client, unregister_all, register_clients, register_clients_async
 from .utils import (
     get_all_wiz_handles,
     count_wiz_clients,
@@ -7,12 +7,33 @@ from .utils import (
     run_threads,
 )
 from .card import Card
-from .battle import Battle
-from .mouse import Mouse
-from .window import Window
+from .hand import Hand
+from .battle import Battle, BattleFrame
+from .loading import LoadingFrame, wait_loaded
+from .dialog import DialogDriver
+from .friends import FriendIndex
+from .navigation import WaypointGraph
+from .trajectory import Trajectory
+from .movement import MovementController
+from .autopilot import QuestAutopilot, run_autopilots
+from .team import TeamBattle, FollowTheLeader
+from .mouse import Mouse, CursorLock
+from .window import Window, tile_windows
 from .keyboard import Keyboard
-from .pixels import DeviceContext, match_image
+from .pixels import DeviceContext, SharedCapture, match_image, scaled_template
+from .coords import CoordinateSpace, coordinate_space
 from .hotkey import HotkeyEvents
+from .events import ClientEvents, hp_below, mana_below
+from .timing import TimingProfile, calibrate, load_profile
+from .ui_state import (
+    UIState,
+    UI_DETECTORS,
+    PixelProbe,
+    TemplateInRegion,
+    ColorMask,
+    register_detector,
+)
+from .probes import load_detectors, save_labeled_screenshot
 
 # Clean up on exit
 import ctypes
@@ -0,0 +1,228 @@
+# Native imports
+import math
+import time
+import asyncio
+
+# Custom imports
+from .utils import XYZYaw
+from .dialog import DialogDriver, classify_dialog, MORE, PRESS_X
+from .pixels import SharedCapture
+
+ARRIVAL_DISTANCE = 150.0
+""" Distance (in game units) from the quest goal at which the player is considered arrived """
+
+APPROACH_SPEED = 400.0
+""" Estimated walking speed (game units per second), used to space out position polls """
+
+MIN_POLL_INTERVAL = 0.1
+MAX_POLL_INTERVAL = 1.0
+
+ARRIVAL_TIMEOUT = 5.0
+""" Time in seconds to wait for a dialog once arrived before giving up on the quest step """
+
+STEP_TIMEOUT = 180.0
+""" Time in seconds (battles excluded) after which a quest step is given up on """
+
+
+class QuestAutopilot:
+    """
+    Follows the quest arrow: faces the quest goal, walks to it and goes through the dialogs on the way.
+    Position is polled rarely while the goal is far away, and more often as the player gets closer.
+    Every poll reads the position, the quest goal and the battle state together, and classifies
+    a single capture for dialogs with the shared ``UI_DETECTORS``. ``run_autopilots`` captures all its clients
+    with one ``SharedCapture``.
+
+    Requires the ``player_struct`` and ``quest_struct`` hooks to be activated.
+
+    Example:
+        .. code-block:: py
+
+            # One client
+            await QuestAutopilot(p1).run(steps=3)
+
+            # Many clients, at most 4 of them polling at once
+            await run_autopilots(p1, p2, p3, p4, p5, p6, max_concurrency=4)
+    """
+
+    def __init__(
+        self,
+        client,
+        *,
+        semaphore: asyncio.Semaphore = None,
+        arrival_distance: float = ARRIVAL_DISTANCE,
+        approach_speed: float = APPROACH_SPEED,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        arrival_timeout: float = ARRIVAL_TIMEOUT,
+        step_timeout: float = STEP_TIMEOUT,
+        capture: SharedCapture = None,
+    ):
+        """
+        Args:
+            client: the ``Client`` to drive
+            semaphore (asyncio.Semaphore, optional): shared between autopilots to bound the number of polls running at once
+            arrival_distance (float, optional): see ``ARRIVAL_DISTANCE``
+            approach_speed (float, optional): see ``APPROACH_SPEED``
+            min_interval (float, optional): time in seconds between two polls next to the goal. Defaults to 0.1
+            max_interval (float, optional): time in seconds between two polls far from the goal. Defaults to 1
+            arrival_timeout (float, optional): see ``ARRIVAL_TIMEOUT``
+            step_timeout (float, optional): see ``STEP_TIMEOUT``
+            capture (SharedCapture, optional): shared capture of the client's window. Defaults to None (capture the window alone)
+        """
+        self.client = client
+        self.semaphore = semaphore or asyncio.Semaphore(1)
+        self.arrival_distance = arrival_distance
+        self.approach_speed = approach_speed
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.arrival_timeout = arrival_timeout
+        self.step_timeout = step_timeout
+        self.capture = capture
+
+        self.steps = 0
+        self.polls = 0
+
+    def poll_interval(self, distance: float) -> float:
+        """
+        Time to wait before the next poll: roughly the time to walk to the arrival distance, within ``min_interval`` and ``max_interval``
+        """
+        eta = (distance - self.arrival_distance) / self.approach_speed
+        return min(self.max_interval, max(self.min_interval, eta))
+
+    async def _sense(self):
+        """ Reads the position, the quest goal, the battle state and the dialog state at once """
+        walker = self.client.walker
+        async with self.semaphore:
+            position, goal, in_battle = await asyncio.gather(
+                walker.body.position(),
+                walker.quest_position.position(),
+                self.client.events.read("in_battle", max_age=self.min_interval),
+            )
+            if self.capture is None:
+                image = self.client.get_image()
+            else:
+                image = self.capture.view(self.client, max_age=self.min_interval)
+            dialog = classify_dialog(image, self.client.coords)
+        self.polls += 1
+        return position, goal, in_battle, dialog
+
+    async def step(self) -> bool:
+        """
+        Goes to the quest goal and through its dialog. The client is marked as moving meanwhile (see ``Client.movement``).
+        A "press x" prompt is only answered next to the goal: the prompt of the previous NPC is ignored.
+
+        Returns:
+            True if a dialog was completed, False if none showed up after arriving or the step timed out
+        """
+        with self.client.movement():
+            return await self._step()
+
+    async def _step(self) -> bool:
+        walk_task = None
+        walk_goal = None
+        arrived_at = None
+        deadline = time.monotonic() + self.step_timeout
+
+        def stop_walking():
+            nonlocal walk_task
+            if walk_task is not None:
+                walk_task.cancel()
+                walk_task = None
+
+        try:
+            while True:
+                position, goal, in_battle, dialog = await self._sense()
+
+                if in_battle:
+                    stop_walking()
+                    arrived_at = None
+                    await asyncio.sleep(self.max_interval)
+                    # Battles don't count towards the step timeout
+                    deadline += self.max_interval
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.client.log("Quest step timed out")
+                    return False
+
+                distance = math.hypot(goal.x - position.x, goal.y - position.y)
+
+                if dialog == MORE or (
+                    dialog == PRESS_X and distance <= self.arrival_distance
+                ):
+                    stop_walking()
+                    driver = DialogDriver(self.client, capture=self.capture)
+                    try:
+                        await asyncio.wait_for(driver.run(1), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        self.client.log("Quest step timed out in a dialog")
+                        return False
+                    self.steps += 1
+                    return True
+
+                if distance <= self.arrival_distance:
+                    stop_walking()
+                    now = time.monotonic()
+                    if arrived_at is None:
+                        arrived_at = now
+                    elif now - arrived_at > self.arrival_timeout:
+                        self.client.log("Arrived, but no dialog showed up")
+                        return False
+                    await asyncio.sleep(self.min_interval)
+                    continue
+
+                arrived_at = None
+                moved_goal = walk_goal is not None and (
+                    math.hypot(goal.x - walk_goal.x, goal.y - walk_goal.y)
+                    > self.arrival_distance
+                )
+                if walk_task is None or walk_task.done() or moved_goal:
+                    stop_walking()
+                    walk_goal = goal
+                    await self.client.face_quest_destination()
+                    walk_task = asyncio.create_task(
+                        self.client.walk_to(XYZYaw(x=goal.x, y=goal.y, z=goal.z, yaw=0))
+                    )
+
+                await asyncio.sleep(self.poll_interval(distance))
+        finally:
+            stop_walking()
+
+    async def run(self, steps: int = None):
+        """
+        Completes ``steps`` quest steps (until cancelled if None)
+
+        Returns:
+            int: the number of quest steps completed
+        """
+        start = self.steps
+        while steps is None or self.steps - start < steps:
+            if not await self.step():
+                break
+        return self.steps - start
+
+
+async def run_autopilots(
+    *clients, max_concurrency: int = 4, steps: int = None, **kwargs
+):
+    """
+    Runs a ``QuestAutopilot`` for every client, with at most ``max_concurrency`` polls running at once.
+    The clients are captured together with a ``SharedCapture``.
+
+    Args:
+        clients: the clients to drive
+        max_concurrency (int, optional): number of clients polling at the same time. Defaults to 4
+        steps (int, optional): quest steps to complete per client. Defaults to None (until cancelled)
+        kwargs: additional ``QuestAutopilot`` options
+
+    Returns:
+        list of the number of quest steps completed by every client
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    capture = SharedCapture(*clients) if len(clients) > 1 else None
+    autopilots = [
+        QuestAutopilot(c, semaphore=semaphore, capture=capture, **kwargs)
+        for c in clients
+    ]
+    return await asyncio.gather(*[a.run(steps) for a in autopilots])
@@ -1,12 +1,94 @@
 # Native imports
 import sys
+import time
+from collections import namedtuple
 from contextlib import suppress
 import asyncio
 
 # Custom imports
-from .pixels import DeviceContext, match_image
+from .pixels import DeviceContext, match_image, image_pixel_matches_color, crop
 from .card import Card
 from .utils import packaged_img
+from .ui_state import UI_DETECTORS
+
+# Pixels of the `flee` button, matched to know if it's our turn to play
+TURN_PROBES = [((546, 398), (255, 255, 0)), ((578, 394), (124, 68, 0))]
+# Name plates of the enemies (0 - 3)
+PLATE_COLOR = (207, 186, 135)
+ENEMY_PLATE_PROBES = [((174 * i) + 203, 75) for i in range(4)]
+
+AREA_ENEMY_FIRST = (230, 240, 80, 60)
+
+
+class BattleFrame(
+    namedtuple("BattleFrame", "image timestamp is_turn enemies enemy_first idle")
+):
+    """
+    Immutable snapshot of a battle, computed from a single capture of the window.
+
+    Attributes:
+        image: the captured window (read-only)
+        timestamp: ``time.monotonic()`` value of the capture
+        is_turn (bool): it's our turn to play
+        enemies (tuple): positions of the enemies present (0 - 3)
+        enemy_first (bool): the turn arrow points to the enemies
+        idle (bool): the player is out of the battle (the spellbook is visible)
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_image(cls, image, timestamp=None, coords=None) -> "BattleFrame":
+        """
+        Analyzes a full window capture returned by ``get_image``
+
+        Args:
+            image: the capture
+            timestamp (optional): ``time.monotonic()`` value of the capture. Defaults to now
+            coords (optional): ``CoordinateSpace`` of the captured window. Defaults to an 800x600 client
+        """
+        image.flags.writeable = False
+
+        def point(xy):
+            return xy if coords is None else coords.point(*xy)
+
+        def plate(xy):
+            return image_pixel_matches_color(
+                image, point(xy), PLATE_COLOR, tolerance=30
+            )
+
+        is_turn = all(
+            image_pixel_matches_color(image, point(xy), color, tolerance=30)
+            for xy, color in TURN_PROBES
+        )
+        enemies = tuple(i for i, xy in enumerate(ENEMY_PLATE_PROBES) if plate(xy))
+
+        enemy_first_area = AREA_ENEMY_FIRST
+        enemy_first_img = packaged_img("enemy-first.png")
+        if coords is not None:
+            enemy_first_area = coords.region(enemy_first_area)
+            enemy_first_img = coords.template(enemy_first_img)
+
+        enemy_first = bool(
+            match_image(crop(image, enemy_first_area), enemy_first_img, threshold=0.2)
+        )
+        idle = UI_DETECTORS["idle"].matches(image, coords)
+
+        return cls(
+            image,
+            time.monotonic() if timestamp is None else timestamp,
+            is_turn,
+            enemies,
+            enemy_first,
+            idle,
+        )
+
+    @classmethod
+    def capture(cls, device_context) -> "BattleFrame":
+        """
+        Captures the window of ``device_context`` and analyzes it
+        """
+        return cls.from_image(device_context.get_image(), coords=device_context.coords)
 
 
 class Battle(DeviceContext):
@@ -37,7 +119,27 @@ class Battle(DeviceContext):
                         await p1.pass_turn()
     """
 
-    def __init__(self, client, name=None, default_image_folder=""):
+    def __init__(
+        self,
+        client,
+        name=None,
+        default_image_folder="",
+        *,
+        poll_fast: float = 0.05,
+        poll_slow: float = 0.5,
+        prefetch: list = None,
+        shared_capture=None,
+    ):
+        """
+        Args:
+            client: the ``Client`` playing the battle
+            name (str, optional): Name of battle for logging purposes.
+            default_image_folder (str, optional): folder to look for images in
+            poll_fast (float, optional): seconds between two turn checks when a turn is expected. Defaults to 0.05
+            poll_slow (float, optional): seconds between two turn checks during the enemies' animations. Defaults to 0.5
+            prefetch (list, optional): spells to look for in the background as soon as a round starts, see ``Hand.prefetch``
+            shared_capture (SharedCapture, optional): read the turn and the frames from this capture of several clients instead of the window
+        """
         super().__init__(client.window_handle)
         self.client = client
         self._default_image_folder = default_image_folder
@@ -54,6 +156,16 @@ class Battle(DeviceContext):
 
         self.in_progress = False
 
+        self._frame = None
+
+        self.poll_fast = poll_fast
+        self.poll_slow = poll_slow
+        self.prefetch = list(prefetch or [])
+        self.shared_capture = shared_capture
+        # Time between the end of our turn and the next one, for the last rounds
+        self._round_gaps = []
+        self._detection_latencies = []
+
         # rectangles defined as (x, y, width, height)
         self._spell_area = (245, 290, 370, 70)
         self._enemy_area = (68, 26, 650, 50)
@@ -73,6 +185,36 @@ class Battle(DeviceContext):
         """
         return self._going_first
 
+    @property
+    def frame(self) -> BattleFrame:
+        """
+        ``BattleFrame`` captured when the current round was detected. None outside of a round.
+        Read from it instead of capturing the window again for the rest of the round.
+        """
+        return self._frame
+
+    @property
+    def detection_latencies(self) -> list:
+        """
+        For every round, the longest time (in seconds) the turn could have been visible before it was detected
+        """
+        return list(self._detection_latencies)
+
+    def capture_frame(self) -> BattleFrame:
+        """
+        Captures the window once and analyzes the turn, the enemies and the turn arrow.
+
+        Returns:
+            BattleFrame: the new snapshot, also available as ``battle.frame``
+        """
+        if self.shared_capture is None:
+            self._frame = BattleFrame.capture(self)
+        else:
+            self._frame = BattleFrame.from_image(
+                self._shared_view(), self.shared_capture.timestamp, self.coords
+            )
+        return self._frame
+
     async def loop(self):
         """
         Handles the looping logic for a battle. The loops exists when the battle ends.
@@ -110,22 +252,43 @@ class Battle(DeviceContext):
         Returns if it's our turn to play
         by matching pixels in the `flee` button
         """
-        flee_yellow = self.pixel_matches_color((546, 398), (255, 255, 0), tolerance=30)
-        flee_brown = self.pixel_matches_color((578, 394), (124, 68, 0), tolerance=30)
-        return flee_yellow and flee_brown
+        if self.shared_capture is not None:
+            image = self._shared_view()
+            return all(
+                image_pixel_matches_color(
+                    image, self.coords.point(*xy), color, tolerance=30
+                )
+                for xy, color in TURN_PROBES
+            )
+
+        return all(
+            self.pixel_matches_color(self.coords.point(*xy), color, tolerance=30)
+            for xy, color in TURN_PROBES
+        )
+
+    def _is_idle(self) -> bool:
+        """ Returns if the player is out of the battle (the spellbook is visible) """
+        if self.shared_capture is not None:
+            return UI_DETECTORS["idle"].matches(self._shared_view(), self.coords)
+        return self.is_idle()
+
+    def _shared_view(self):
+        """ The window in ``shared_capture``. Battles polling within ``poll_fast`` of each other share the blit """
+        return self.shared_capture.view(self.client, max_age=self.poll_fast)
 
     async def _start(self) -> None:
         """
         Waits for the first round then signals to the class that the battle has started.
         used in the `loop()` method
         """
-        while not self._is_turn():
-            await asyncio.sleep(1)
+        await self._wait_for_turn(True)
+        frame = self.capture_frame()
 
         self.is_over = False
         self.in_progress = True
+        self._begin_round()
 
-        self.enemy_first = self._is_enemy_first()
+        self.enemy_first = frame.enemy_first
         self._going_first = not self.enemy_first
 
         who_is = "Enemy is" if self.enemy_first else "You are"
@@ -143,21 +306,105 @@ class Battle(DeviceContext):
         Increase the `_round_count` otherwise
         Used in the `loop()` method
         """
-        while self._is_turn():
-            await asyncio.sleep(1)
+        # Our turn ends as soon as the spells are cast
+        turn_ended, _ = await self._wait_for_turn(False, interval=self.poll_fast)
+        self.client.hand.end_round()
+
+        detected, is_turn = await self._wait_for_turn(
+            True, or_idle=True, expected=self._expected_round_gap()
+        )
+
+        if is_turn:
+            self._round_gaps = (self._round_gaps + [detected - turn_ended])[-5:]
 
-        while not self._is_turn() and not self.is_idle():
-            await asyncio.sleep(1)
+        if self.client.events.running:
+            # Use the client's event poller instead of reading the memory again,
+            # only if it polled after the turn was detected: the fight may have just ended
+            in_battle = await self.client.events.read(
+                "in_battle", max_age=time.monotonic() - detected
+            )
+        else:
+            in_battle = await self.client.walker.in_battle()
 
-        if not await self.client.walker.in_battle():
+        if not in_battle:
             self.log("Battle has finished")
 
             await asyncio.sleep(0.5)
             self.is_over = True
             self.in_progress = False
+            self._frame = None
         else:
             self._round_count += 1
+            self.capture_frame()
+            self._begin_round()
             self.print_round()
+            self.log(
+                f"Turn detected within {self._detection_latencies[-1] * 1000:.0f} ms"
+            )
+
+    def _begin_round(self):
+        """ Resets the hand and starts scanning it for the likely spells """
+        self.client.hand.begin_round()
+        if self.prefetch:
+            self.client.hand.prefetch(*self.prefetch)
+
+    def _expected_round_gap(self):
+        """ Shortest time the enemies took to play during the last rounds """
+        return min(self._round_gaps) if self._round_gaps else None
+
+    def _poll_interval(self, elapsed, expected) -> float:
+        """
+        Polls slowly while the enemies' animations are playing, and fast around the expected turn.
+        Once the turn is late, the interval doubles every ``poll_slow`` seconds, back up to ``poll_slow``.
+        """
+        if expected is None:
+            return (self.poll_fast + self.poll_slow) / 2
+
+        if elapsed + self.poll_slow < expected * 0.8:
+            return self.poll_slow
+
+        overdue = elapsed - expected
+        if overdue <= 0:
+            return self.poll_fast
+
+        return min(self.poll_slow, self.poll_fast * 2 ** (overdue / self.poll_slow))
+
+    async def _wait_for_turn(
+        self, turn: bool, *, or_idle=False, interval=None, expected=None
+    ) -> tuple:
+        """
+        Polls the 2 pixels of ``TURN_PROBES`` (from ``shared_capture`` if set) until the turn state is ``turn``, or the spellbook is visible with ``or_idle``.
+        The whole window is only captured once the state is detected (see ``capture_frame``). Records the detection latency.
+
+        Args:
+            turn (bool): turn state to wait for
+            or_idle (bool, optional): also stop when the player is out of the battle. Defaults to False
+            interval (float, optional): fixed time between two checks. Adaptive by default
+            expected (float, optional): time after which the state is expected to be detected
+
+        Returns:
+            (timestamp, is_turn) of the check that detected the state
+        """
+        start = time.monotonic()
+        last_miss = None
+
+        while True:
+            is_turn = self._is_turn()
+            timestamp = time.monotonic()
+            if is_turn == turn or (or_idle and self._is_idle()):
+                break
+
+            last_miss = timestamp
+            if interval is None:
+                delay = self._poll_interval(last_miss - start, expected)
+            else:
+                delay = interval
+            await asyncio.sleep(delay)
+
+        latency = 0 if last_miss is None else timestamp - last_miss
+        if interval is None:
+            self._detection_latencies.append(latency)
+        return timestamp, is_turn
 
     def get_enemy_positions(self):
         """
@@ -181,15 +428,16 @@ class Battle(DeviceContext):
                         # Cast at enemy position
                         await firecat.cast(target=first_enemy)
         """
-        Y = 75
-        COLOR = (207, 186, 135)
-        enemies = []
-        for i in range(4):
-            X = (174 * (i)) + 203
-            if self.pixel_matches_color((X, Y), COLOR, tolerance=30):
-                enemies.append(i)
-
-        return enemies
+        if self._frame is not None:
+            return list(self._frame.enemies)
+
+        return [
+            i
+            for i, xy in enumerate(ENEMY_PLATE_PROBES)
+            if self.pixel_matches_color(
+                self.coords.point(*xy), PLATE_COLOR, tolerance=30
+            )
+        ]
 
     def get_enemy_count(self):
         """
@@ -225,13 +473,12 @@ class Battle(DeviceContext):
         return False
 
     def _is_enemy_first(self):
-        turn_arrow_region = (230, 240, 80, 60)
         return bool(
             self.client.locate_on_screen(
                 "enemy-first.png",
-                region=turn_arrow_region,
+                region=AREA_ENEMY_FIRST,
                 threshold=0.2,
                 folder=packaged_img(),
+                canonical=True,
             )
         )
-
@@ -3,18 +3,52 @@ import asyncio
 
 # Custom imports
 from wizsdk.mouse import Mouse
+from wizsdk.timing import get_delay
 
 
 mouse = Mouse()
 Card = None
 
 
+def _card_click_timings() -> dict:
+    """ ``Client.click_and_wait`` timings for clicks on cards and targets """
+    return dict(
+        duration=get_delay("card.move"),
+        delay=get_delay("card.hover"),
+        timeout=get_delay("card.response"),
+    )
+
+
 class Card:
-    def __init__(self, client, name, spell_x):
+    def __init__(self, client, name, spell_x, hand=None, original_x=None):
+        """
+        Args:
+            client: the ``Client`` holding the card
+            name: name of the spell
+            spell_x: x position of the card
+            hand (optional): the ``Hand`` the card was found in. Keeps ``spell_x`` up to date when other cards leave the hand
+            original_x (optional): x position of the card when the hand was scanned
+        """
         self.client = client
         self.name = name
-        self.spell_x = spell_x
+        self._spell_x = spell_x
         self.spell_y = 325
+        self.hand = hand
+        self.original_x = original_x
+
+    @property
+    def spell_x(self):
+        """
+        Current x position of the card
+        """
+        if self.hand is not None and self.original_x is not None:
+            return self.hand.current_x(self.original_x)
+        return self._spell_x
+
+    @spell_x.setter
+    def spell_x(self, value):
+        self._spell_x = value
+        self.original_x = None
 
     def __str__(self):
         return f"{self.name} at ({self.spell_x}, {self.spell_y})"
@@ -31,13 +65,14 @@ class Card:
 
         card_width = 52
         enchant_is_before = self.spell_x < spell.spell_x
+        spell_area = self.client.hand.area
         # click self
-        await self.client.mouse.click(
-            self.spell_x, self.spell_y, duration=0.3, delay=0.6
+        await self.client.click_and_wait(
+            self.spell_x, self.spell_y, spell_area, **_card_click_timings()
         )
         # click spell
-        await self.client.mouse.click(
-            spell.spell_x, spell.spell_y, duration=0.3, delay=0.6
+        enchanted = await self.client.click_and_wait(
+            spell.spell_x, spell.spell_y, spell_area, **_card_click_timings()
         )
         # calculate new spell_x of enchanted spell
 
@@ -47,7 +82,20 @@ class Card:
 
         new_name = f"{self.name}-{spell.name}"
 
-        await asyncio.sleep(0.2)
+        if not enchanted:
+            await asyncio.sleep(get_delay("card.enchant_fallback"))
+
+        if self.hand is not None and spell.hand is self.hand:
+            self.hand.remove(self)
+            self.hand.rename(spell, new_name)
+            return Card(
+                self.client,
+                new_name,
+                new_pos,
+                hand=self.hand,
+                original_x=spell.original_x,
+            )
+
         return Card(self.client, new_name, new_pos)
 
     async def cast(self, target=None):
@@ -65,9 +113,12 @@ class Card:
             target (int, optional): The target to select after clicking the spell
         """
         self.client.log(f"Casting {self.name}")
-        await self.client.mouse.click(
-            self.spell_x, self.spell_y, duration=0.3, delay=0.6
+        spell_area = self.client.hand.area
+        await self.client.click_and_wait(
+            self.spell_x, self.spell_y, spell_area, **_card_click_timings()
         )
+        if self.hand is not None:
+            self.hand.remove(self)
 
         if target != None:
             if target < 4:
@@ -81,8 +132,25 @@ class Card:
                     f"Invalid value for target, expect int between 0 - 7, got {target}"
                 )
                 return False
-            await self.client.mouse.click(x, y, duration=0.3, delay=0.6)
-            await asyncio.sleep(
-                0.5
-            )  # Helps when changing the active state of overlapping windows.
+            if not await self.client.click_and_wait(
+                x, y, spell_area, **_card_click_timings()
+            ):
+                # Helps when changing the active state of overlapping windows.
+                await asyncio.sleep(get_delay("card.target_fallback"))
 
+    async def discard(self):
+        """
+        Discards the card by right clicking it
+        """
+        self.client.log(f"Discarding {self.name}")
+        discarded = await self.client.click_and_wait(
+            self.spell_x,
+            self.spell_y,
+            self.client.hand.area,
+            button="right",
+            **_card_click_timings(),
+        )
+        if self.hand is not None:
+            self.hand.remove(self)
+        if not discarded:
+            await asyncio.sleep(get_delay("card.enchant_fallback"))
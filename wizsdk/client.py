@@ -1,8 +1,9 @@
 # Native imports
-from contextlib import suppress
+from contextlib import suppress, contextmanager
 import ctypes
-import os, sys
+import os, sys, time
 import asyncio
+import functools
 from typing import Optional
 
 # Third-party imports
@@ -12,18 +13,41 @@ import wizwalker
 from wizwalker import XYZ
 
 # Custom imports
-from .utils import get_all_wiz_handles, XYZYaw, packaged_img
-from .pixels import DeviceContext, match_image
+from .utils import get_all_wiz_handles, XYZYaw
+from .pixels import DeviceContext
 from .keyboard import Keyboard
 from .mouse import Mouse
 from .window import Window
 from .battle import Battle
 from .card import Card
+from .events import ClientEvents, BATTLE_ENDED, ZONE_CHANGED
+from .hand import Hand
+from .dialog import DialogDriver
+from .friends import FriendIndex, default_friend_index, friend_key
+from .navigation import WaypointGraph
+from .movement import MovementController, MoveResult, ARRIVAL_TOLERANCE
+from .loading import (
+    wait_loaded,
+    POLL_INTERVAL as LOADING_POLL_INTERVAL,
+    LOADING_TIMEOUT,
+    START_TIMEOUT,
+)
+from .timing import get_delay, FRIENDS_ICON_RETRIES, _locate_friends_icon
+from .ui_state import UI_DETECTORS, UIState, AREA_CONFIRM
 
 # rectangles defined as (x, y, width, height)
 AREA_FRIENDS = (623, 63, 35, 250)
 AREA_SPELLS = (245, 290, 370, 70)
-AREA_CONFIRM = (355, 370, 100, 70)
+AREA_TURN_BUTTONS = (230, 380, 370, 30)
+
+# Friend rows are matched within this many pixels of their last position
+FRIEND_ROW_MARGIN = 20
+
+BACKPACK_TIMEOUT = 2.0
+""" Time in seconds to wait for the backpack space once the backpack is opened, before pressing "b" again """
+
+BACKPACK_RETRIES = 2
+""" Times the backpack is toggled again when its space can't be read """
 
 SPELLS_FOLDER = "spells"
 """ Default folder to look for spells in"""
@@ -71,12 +95,76 @@ class Client(DeviceContext, Keyboard, Window):
         self.name = None
 
         self._default_image_folder = IMAGE_FOLDER
-        self.walker = None
+        self._walker = None
         self.silent_mouse = silent_mouse
-        self.mouse = None
+        self._mouse = None
+        self.events = ClientEvents(self)
+        self.hand = Hand(self, AREA_SPELLS)
+
+        # (space used, space total), invalidated by the events that can change it
+        self._backpack_space = None
+        self._backpack_refresh_task = None
+        # Number of movements (walks, teleports, autopilots) in progress
+        self._movements = 0
+        self.events.on(BATTLE_ENDED, self.invalidate_backpack_space)
+        self.events.on(ZONE_CHANGED, self.invalidate_backpack_space)
+
+    @property
+    def walker(self) -> wizwalker.Client:
+        """
+        The wizwalker client used for memory access. It is attached on first use,
+        so scripts that only rely on pixels, images and the keyboard never pay for it.
+        """
+        if self._walker is None and self.window_handle:
+            self.attach_walker()
+        return self._walker
+
+    @walker.setter
+    def walker(self, walker):
+        self._walker = walker
+
+    @property
+    def walker_attached(self) -> bool:
+        """
+        True if the wizwalker client has been attached
+        """
+        return self._walker is not None
+
+    def attach_walker(self) -> wizwalker.Client:
+        """
+        Attaches the wizwalker client to the window if it isn't attached already.
+        This is done automatically the first time a memory based method is used.
+
+        Returns:
+            The wizwalker client
+        """
+        if self._walker is None:
+            self._walker = wizwalker.Client(self.window_handle)
+        return self._walker
+
+    @property
+    def mouse(self) -> Mouse:
+        """
+        The ``Mouse`` linked to the window. Silent mode attaches the wizwalker client when the mouse is first used.
+        """
+        if self._mouse is None:
+            walker = self.walker if self.silent_mouse else None
+            self._mouse = Mouse(self.window_handle, self.silent_mouse, walker)
+        return self._mouse
+
+    @mouse.setter
+    def mouse(self, mouse):
+        self._mouse = mouse
 
     @classmethod
-    def register(cls, nth=0, name=None, handle=None, silent_mouse: bool = False):
+    def register(
+        cls,
+        nth=0,
+        name=None,
+        handle=None,
+        silent_mouse: bool = False,
+        lazy_walker: bool = True,
+    ):
         """
         Assigns the instance to a wizard101 window. (Required before using any other SDK methods)
 
@@ -84,6 +172,7 @@ class Client(DeviceContext, Keyboard, Window):
             nth (int, optional): Index of the wizard101 client to use (if there's more than one)
             name (str, optional): Name to prepend to the window title. Used for identifying which windows are controlled.
             silent_mouse: When enabled, moves the mouse without taking control of the actual cursor
+            lazy_walker (bool, optional): Wait for the first memory based call to attach wizwalker. Defaults to True
         """
         client = cls()
         global all_clients
@@ -105,9 +194,8 @@ class Client(DeviceContext, Keyboard, Window):
         # A window exists, add it to global variable
         all_clients.append(client)
 
-        client.walker = wizwalker.Client(client.window_handle)
-
-        client.mouse = Mouse(client.window_handle, client.silent_mouse, client.walker)
+        if not lazy_walker:
+            client.attach_walker()
 
         if name:
             client.set_name(name)
@@ -167,9 +255,42 @@ class Client(DeviceContext, Keyboard, Window):
         Properly unregister hooks and clean up possible ongoing asyncio tasks
         """
         user32.SetWindowTextW(self.window_handle, "Wizard101")
-        await self.walker.close()
+        self.stop_backpack_refresh()
+        await self.events.stop()
+        if self.walker_attached:
+            await self.walker.close()
         return 1
 
+    async def click_and_wait(
+        self, x, y, region, *, duration=0.3, delay=0.1, timeout=0.6, button="left"
+    ) -> bool:
+        """
+        Clicks at ``x``, ``y`` and waits for ``region`` to change, confirming the click had an effect.
+        The region is captured once the mouse is in place, so hover effects aren't mistaken for the click's effect.
+        Coordinates are canonical (800x600 client), they are mapped to the client size with ``coords``.
+
+        Args:
+            x, y: position to click, relative to the window
+            region: (x, y, width, height) area that changes when the click is registered
+            duration: time in seconds to move the mouse. Defaults to 0.3
+            delay: time in seconds to wait before clicking. Defaults to 0.1
+            timeout: time in seconds to wait for the change. Defaults to 0.6
+            button: "left" or "right". Defaults to "left"
+
+        Returns:
+            True if the change was seen, False if it timed out.
+        """
+        # Let a background hand scan finish moving the mouse
+        await self.hand.wait_prefetch()
+        x, y = self.coords.point(x, y)
+        region = self.coords.region(region)
+        async with self.mouse.hold():
+            await self.mouse.move_to(x, y, duration=duration)
+            await asyncio.sleep(delay)
+            reference = self.get_image(region)
+            await self.mouse.click(x, y, button=button, duration=0, delay=0)
+        return await self.wait_for_change(region, timeout, reference=reference)
+
     async def wait(self, seconds: float):
         """
         Alias for asyncio.sleep()
@@ -273,6 +394,27 @@ class Client(DeviceContext, Keyboard, Window):
             1,
         )
 
+    def ui_state(self, image=None) -> UIState:
+        """
+        Evaluates every detector of ``UI_DETECTORS`` (crown shop, idle, dialog, press x, confirm, health and mana low) from a single capture.
+
+        Args:
+            image (optional): a capture of the whole window. Defaults to a new capture
+
+        Returns:
+            UIState: the flags of the detectors that matched
+
+        Examples:
+            .. code-block:: py
+
+                state = player.ui_state()
+                if state.health_low:
+                    await player.use_potion_if_needed()
+        """
+        if image is None:
+            image = self.get_image()
+        return UIState.evaluate(image, coords=self.coords)
+
     def is_crown_shop(self) -> bool:
         """
         Detects if the crown shop is open by matching a red pixel in the "close" icon.
@@ -280,7 +422,7 @@ class Client(DeviceContext, Keyboard, Window):
         Returns:
             bool: True if the menu is open / False otherwise
         """
-        return self.pixel_matches_color((788, 53), (197, 40, 41), 50)
+        return UI_DETECTORS["crown_shop"].check(self)
 
     def is_idle(self):
         """
@@ -289,22 +431,7 @@ class Client(DeviceContext, Keyboard, Window):
         Returns:
             bool: True if the player is idle / False otherwise
         """
-        # spellbook_yellow = self.pixel_matches_color(
-        #     (781, 551), (255, 251, 64), tolerance=30
-        # )
-        # spellbook_brown = self.pixel_matches_color(
-        #     (728, 587), (79, 29, 29), tolerance=30
-        # )
-
-        # spellbook_gray = self.pixel_matches_color(
-        #     (747, 538), (27, 47, 63), tolerance=30
-        # )
-        # print(spellbook_brown, spellbook_yellow, spellbook_gray)
-        # return spellbook_brown and spellbook_yellow and spellbook_gray
-        spell_book_area = self.get_image(region=(725, 555, 60, 60))
-        return match_image(
-            spell_book_area, packaged_img("spellbook.png"), threshold=0.05
-        )
+        return UI_DETECTORS["idle"].check(self)
 
     def is_dialog_more(self):
         """
@@ -313,9 +440,7 @@ class Client(DeviceContext, Keyboard, Window):
         Returns:
             bool: True if the dialog menu is open / False otherwise
         """
-        more_lower_right = self.pixel_matches_color((674, 621), (110, 30, 53), 15)
-        more_top_left = self.pixel_matches_color((592, 613), (111, 31, 52), 15)
-        return more_lower_right and more_top_left
+        return UI_DETECTORS["dialog_more"].check(self)
 
     def is_health_low(self):
         """
@@ -325,11 +450,7 @@ class Client(DeviceContext, Keyboard, Window):
         Returns:
             bool: is the health low
         """
-        # Matches a pixel in the lower third of the health globe
-        POSITION = (23, 563)
-        COLOR = (126, 41, 3)
-        TOLERANCE = 15
-        return not self.pixel_matches_color(POSITION, COLOR, tolerance=TOLERANCE)
+        return UI_DETECTORS["health_low"].check(self)
 
     def is_mana_low(self):
         """
@@ -339,11 +460,7 @@ class Client(DeviceContext, Keyboard, Window):
         Returns:
             bool: is the mana low
         """
-        # Matches a pixel in the lower third of the mana globe
-        POSITION = (79, 591)
-        COLOR = (66, 13, 83)
-        TOLERANCE = 15
-        return not self.pixel_matches_color(POSITION, COLOR, tolerance=TOLERANCE)
+        return UI_DETECTORS["mana_low"].check(self)
 
     def is_press_x(self):
         """
@@ -352,9 +469,7 @@ class Client(DeviceContext, Keyboard, Window):
         Returns:
             bool: "press X" has been found
         """
-        x_area = self.get_image(region=(350, 540, 100, 20))
-        found = match_image(x_area, packaged_img("x.png"))
-        return found != False
+        return UI_DETECTORS["press_x"].check(self)
 
     def get_confirm(self):
         """
@@ -363,36 +478,111 @@ class Client(DeviceContext, Keyboard, Window):
         Returns:
             tuple: (x, y) where the confirm button has been found
         """
-        confirm_img = self.get_image(AREA_CONFIRM)
-        found = match_image(confirm_img, packaged_img("confirm.png"), threshold=0.2)
-        if found:
-            x = found[0] + AREA_CONFIRM[0]
-            y = found[1] + AREA_CONFIRM[1]
-            found = (x, y)
-
-        return found
+        return UI_DETECTORS["confirm"].locate_on(self)
 
-    async def get_backpack_space_left(self) -> Optional[int]:
+    async def get_backpack_space_left(self, refresh=False) -> Optional[int]:
         """
         Gets the backpack space left. Will try to refresh the value by quickly opening and closing the backpack if necessary. Returns None if it wasn't able to get the value.
 
+        While ``events`` is running, the value is cached until a battle ends, the zone changes or ``invalidate_backpack_space`` is called.
+        See ``start_backpack_refresh`` to refresh it in the background.
+
+        Args:
+            refresh (bool, optional): ignore the cached value. Defaults to False
+
         Returns:
             space left in the backpack, None if it's not able to get the value.
         """
+        if refresh or self._backpack_space is None or not self.events.running:
+            await self._read_backpack_space()
+
+        if self._backpack_space is None:
+            return None
+        space_used, space_total = self._backpack_space
+        return space_total - space_used
 
-        backpack_data = False
+    def invalidate_backpack_space(self, event=None):
+        """
+        Forgets the cached backpack space. The next ``get_backpack_space_left`` reads it again.
+        """
+        self._backpack_space = None
 
-        while not backpack_data:
-            try:
-                backpack_data = await self.walker.backpack_space()
-            except ValueError:
+    async def _read_backpack_space(self):
+        """
+        Reads the backpack space, opening the backpack if needed. The key press is retried
+        ``BACKPACK_RETRIES`` times if the value doesn't show up within ``BACKPACK_TIMEOUT`` seconds.
+
+        Returns:
+            (space used, space total), None if it couldn't be read
+        """
+        opened = False
+        try:
+            for _ in range(BACKPACK_RETRIES + 1):
+                deadline = time.monotonic() + BACKPACK_TIMEOUT
+                while time.monotonic() < deadline:
+                    try:
+                        backpack_data = await self.walker.backpack_space()
+                    except ValueError:
+                        # The value is only available once the backpack has been opened
+                        if not opened:
+                            await self.send_key("b")
+                            opened = True
+                        await asyncio.sleep(0.2)
+                        continue
+
+                    if backpack_data:
+                        self._backpack_space = backpack_data
+                        return backpack_data
+                    await asyncio.sleep(0.2)
+
+                # The key press may have been lost: toggle the backpack again
+                if opened:
+                    await self.send_key("b")
+                    opened = False
+        finally:
+            if opened:
                 await self.send_key("b")
-                await asyncio.sleep(0.2)
 
-        await self.send_key("b")
+        self.log("Could not read the backpack space")
+        return None
 
-        space_used, space_total = backpack_data
-        return space_total - space_used
+    def start_backpack_refresh(self, interval: float = 2.0):
+        """
+        Refreshes the cached backpack space in the background, whenever it has been invalidated
+        and the player is idle out of battle, so ``get_backpack_space_left`` is normally instant.
+        The backpack is never opened while the client is moving (see ``movement``).
+        Starts ``events`` if it isn't running.
+
+        Args:
+            interval (float, optional): time in seconds between two checks. Defaults to 2
+        """
+        self.events.start()
+        if self._backpack_refresh_task is None or self._backpack_refresh_task.done():
+            self._backpack_refresh_task = asyncio.create_task(
+                self._backpack_refresh_loop(interval)
+            )
+
+    def stop_backpack_refresh(self):
+        """
+        Stops the background refresh started with ``start_backpack_refresh``
+        """
+        if self._backpack_refresh_task is not None:
+            self._backpack_refresh_task.cancel()
+            self._backpack_refresh_task = None
+
+    async def _backpack_refresh_loop(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            if (
+                self._backpack_space is None
+                and not self.is_moving
+                and self.events.in_battle is False
+                and self.is_idle()
+            ):
+                try:
+                    await self._read_backpack_space()
+                except Exception as e:
+                    self.log(f"Backpack refresh failed: {e}")
 
     """
     ACTIONS BASED ON STATES
@@ -422,36 +612,38 @@ class Client(DeviceContext, Keyboard, Window):
         if mana_low or health_low:
             await self.mouse.click(160, 590, delay=0.2)
 
-    async def finish_loading(self, *, timeout=None) -> bool:
+    async def finish_loading(
+        self, *, timeout=LOADING_TIMEOUT, start_timeout=START_TIMEOUT
+    ) -> bool:
         """
-        Waits for player to have gone through the loading screen.
-        If this function is called too late and the player is already out of the loading screen, it will wait indefinitely.
+        Waits for player to have gone through the loading screen. Resolves on the first frame where the world is drawn again.
+        If no loading screen shows up within ``start_timeout`` (teleport in the same zone, or called after the loading screen), the player is considered loaded.
 
         Args:
-            timeout (optional): value in seconds to timeout if it hasn't finished yet. Defaults to None
+            timeout (optional): value in seconds to timeout if it hasn't finished yet. Defaults to ``LOADING_TIMEOUT`` (60)
+            start_timeout (optional): value in seconds after which the player is considered already loaded if no loading screen showed up. None to wait for a loading screen until ``timeout``. Defaults to ``START_TIMEOUT`` (3)
 
         Returns:
             True if the function completed successfully, False if the function timed out.
         """
-
-        async def _loading_coro():
-            self.log("Awaiting loading")
-
-            self.walker.wait_for_zone_change()
-
-            await asyncio.sleep(2)
-
-        # run it with the timeout
-        try:
-            await asyncio.wait_for(_loading_coro(), timeout=timeout)
-            return True
-        except asyncio.TimeoutError:
+        self.log("Awaiting loading")
+        results = await wait_loaded(self, start_timeout=start_timeout, timeout=timeout)
+        if self not in results:
+            self.log("Still loading, giving up")
             return False
 
+        loading_time = results[self]
+        if loading_time is None:
+            self.log("No loading screen detected")
+        else:
+            self.log(f"Loaded in {loading_time:.2f}s")
+        return True
+
     async def go_through_dialog(self, times=1, *, timeout=None):
         # Wait for press X, or more/done button
         """
         Goes through the prompts of the dialog ("press x" or "more"/"continue"). Waits for "press x" or the dialog box before starting.
+        Every frame is classified once by a ``DialogDriver``, which reacts as soon as a prompt shows up.
 
         Args:
             times (int): Defaults to 1
@@ -462,24 +654,14 @@ class Client(DeviceContext, Keyboard, Window):
             True if the function completed successfully, False if the function timed out.
         """
 
+        driver = DialogDriver(self)
+
         async def _dialog_coro(times):
             self.log("Going through dialog")
-            while times >= 1:
-                times -= 1
-                while (not self.is_press_x()) and (not self.is_dialog_more()):
-                    await asyncio.sleep(0.5)
-
-                if self.is_press_x():
-                    await self.send_key("X", 0.1)
-
-                while not self.is_dialog_more():
-                    await asyncio.sleep(0.5)
-
-                while self.is_dialog_more():
-                    await self.send_key("SPACEBAR", 0.1)
-                    await asyncio.sleep(0.1)
-
-            await asyncio.sleep(1)
+            await driver.run(times)
+            self.log(
+                f"{driver.dialogs} dialogs ({driver.pages} pages) in {driver.elapsed:.2f}s, {driver.rate:.2f} dialogs/s"
+            )
 
         # run it with the timeout
         try:
@@ -513,7 +695,7 @@ class Client(DeviceContext, Keyboard, Window):
             while not (
                 self.pixel_matches_color((361, 599), (133, 36, 62), tolerance=20)
             ):
-                await self.wait(0.5)
+                await self.wait(LOADING_POLL_INTERVAL)
 
             self.log("Logging back in")
             await self.mouse.click(395, 594)
@@ -565,14 +747,19 @@ class Client(DeviceContext, Keyboard, Window):
         """
 
         async def _confirm_coro():
-            await self.wait(0.2)  #
+            await self.wait(get_delay("confirm.appear"))
             confirm = self.get_confirm()
             while not confirm:
-                await self.wait(0.5)
+                await self.wait(get_delay("confirm.poll"))
                 confirm = self.get_confirm()
 
-            await self.mouse.click(*confirm, duration=0.2, delay=0.2)
-            await self.wait(0.5)
+            await self.click_and_wait(
+                *confirm,
+                AREA_CONFIRM,
+                duration=get_delay("confirm.move"),
+                delay=get_delay("confirm.hover"),
+                timeout=get_delay("confirm.response"),
+            )
 
         # run it with the timeout
         try:
@@ -585,6 +772,32 @@ class Client(DeviceContext, Keyboard, Window):
     POSITION & MOVEMENT
     """
 
+    @contextmanager
+    def movement(self):
+        """
+        Marks the client as moving while the block runs, so background actions (like the backpack refresh)
+        don't press keys in the middle of it. ``walk_to``, ``teleport_to``, ``steer_to``, ``travel_to``,
+        ``QuestAutopilot`` and ``FollowTheLeader`` use it.
+
+        Example:
+            .. code-block:: py
+
+                with player.movement():
+                    await player.walker.goto(x, y)
+        """
+        self._movements += 1
+        try:
+            yield
+        finally:
+            self._movements -= 1
+
+    @property
+    def is_moving(self) -> bool:
+        """
+        True while a ``movement`` is in progress
+        """
+        return self._movements > 0
+
     async def get_quest_xyz(self) -> tuple:
         """
         Gets the X, Y, Z coordinates to the quest destination
@@ -619,10 +832,11 @@ class Client(DeviceContext, Keyboard, Window):
         if await self.walker.move_lock():
             return
 
-        await self.walker.teleport(
-            XYZ(location.x, location.y, location.z), location.yaw
-        )
-        await self.send_key("W", 0.1)
+        with self.movement():
+            await self.walker.teleport(
+                XYZ(location.x, location.y, location.z), location.yaw
+            )
+            await self.send_key("W", 0.1)
 
     async def walk_to(self, location: XYZYaw, mount_speed: float = -1):
         """
@@ -639,57 +853,204 @@ class Client(DeviceContext, Keyboard, Window):
         if mount_speed != -1:
             print("Mound_speed is deprecated. Wizwalker now gets the speed from memory")
 
-        await self.walker.goto(location.x, location.y)
+        with self.movement():
+            await self.walker.goto(location.x, location.y)
+
+    async def steer_to(
+        self, location: XYZYaw, tolerance: float = ARRIVAL_TOLERANCE, timeout=None
+    ) -> MoveResult:
+        """
+        Walks to ``location`` holding W, and corrects the heading while moving so long walks don't drift.
+        Stops within ``tolerance`` of the destination. See ``MovementController``.
+        Requires the `player_struct` hook to be activated.
+
+        Args:
+            location (XYZYaw): The location to walk to.
+                (Only the x and y value will actually be used)
+            tolerance (float, optional): distance from the destination to stop at. Defaults to ``ARRIVAL_TOLERANCE``
+            timeout (optional): time in seconds after which the walk is abandoned. Defaults to None
+
+        Returns:
+            MoveResult: whether the player arrived, and the time it took
+        """
+        with self.movement():
+            result = await MovementController(self, tolerance).move_to(
+                location, timeout
+            )
+        if result.arrived:
+            self.log(
+                f"Arrived in {result.elapsed:.2f}s ({result.corrections} corrections)"
+            )
+        else:
+            self.log(f"Stopped {result.distance:.0f} units from the destination")
+        return result
+
+    async def travel_to(
+        self, location: XYZYaw, graph: WaypointGraph, teleport: bool = False
+    ) -> bool:
+        """
+        Goes to ``location`` through the waypoints of ``graph``, following the shortest recorded route.
+        Requires the `player_struct` hook to be activated.
+
+        Args:
+            location (XYZYaw): The location to go to.
+            graph (WaypointGraph): waypoints of the current zone
+            teleport (bool, optional): teleport from waypoint to waypoint instead of walking. Defaults to False
+
+        Returns:
+            bool: False if no route was found
+        """
+        start = await self.get_player_location()
+        route = graph.route((start.x, start.y, start.z), location[:3])
+        if route is None:
+            self.log("No route found")
+            return False
+
+        previous = XYZ(start.x, start.y, start.z)
+        with self.movement():
+            for x, y, z in route.tolist():
+                waypoint = XYZ(x, y, z)
+                if teleport:
+                    yaw = previous.yaw(waypoint)
+                    await self.teleport_to(XYZYaw(x=x, y=y, z=z, yaw=yaw))
+                else:
+                    await self.walk_to(XYZYaw(x=x, y=y, z=z, yaw=0))
+                previous = waypoint
+
+            if teleport:
+                await self.teleport_to(location)
+        return True
+
+    async def _open_friend_list(self) -> bool:
+        """
+        Closes the friend list if it is opened, then opens it on the first page
+
+        Returns:
+            False if the friend list icon wasn't found after ``FRIENDS_ICON_RETRIES`` toggles
+        """
+        # Check if friends already opened (and close it)
+        for _ in range(FRIENDS_ICON_RETRIES):
+            if _locate_friends_icon(self):
+                break
+            await self.send_key("F")
+            await self.wait(get_delay("friends.toggle"))
+        else:
+            if not _locate_friends_icon(self):
+                return False
+
+        # Open friend menu
+        await self.send_key("F")
+        await self.wait(get_delay("friends.toggle"))
+        return True
+
+    def _is_last_friend_page(self) -> bool:
+        return not self.pixel_matches_color(
+            self.coords.point(775, 328), (206, 44, 24), 50
+        )
+
+    async def _next_friend_page(self):
+        await self.click_and_wait(
+            775,
+            328,
+            AREA_FRIENDS,
+            duration=get_delay("friends.move"),
+            delay=0,
+            timeout=get_delay("friends.page_move"),
+        )
+
+    async def _jump_to_friend(self, match_img, page: int, y: int):
+        """ Goes to ``page`` and looks for the friend on the row at ``y`` only """
+        for _ in range(page - 1):
+            if self._is_last_friend_page():
+                return False
+            await self._next_friend_page()
+
+        x, top, w, h = AREA_FRIENDS
+        row_top = max(top, y - FRIEND_ROW_MARGIN)
+        row_bottom = min(top + h, y + FRIEND_ROW_MARGIN)
+        return self.locate_on_screen(
+            match_img,
+            region=(x, row_top, w, row_bottom - row_top),
+            threshold=0.2,
+            canonical=True,
+        )
+
+    async def _scan_friends(self, match_img):
+        """ Looks for the friend on every page, starting from the current one """
+        page = 1
+        while True:
+            found = self.locate_on_screen(
+                match_img, region=AREA_FRIENDS, threshold=0.2, canonical=True
+            )
+            if found or self._is_last_friend_page():
+                return page, found
+
+            await self._next_friend_page()
+            page += 1
 
-    async def teleport_to_friend(self, match_img) -> bool:
+    async def teleport_to_friend(self, match_img, *, index: FriendIndex = None) -> bool:
         """
         Completes a set of actions to teleport to a friend.
         The friend must have the proper symbol next to it.
         The symbol must match the image passed as 'match_img'.
 
+        The page and row the friend was found on are remembered in a ``FriendIndex``. Next time, the friend list
+        jumps straight to that page and the row is checked with a single match. The whole list is scanned if the friend moved.
+
         Args:
             match_img: A string of the image file name, or a list of bytes returned by ``Client.get_image``
                 The friend icon to find to select which friend to teleport to.
+            index (FriendIndex, optional): where friend positions are remembered. Defaults to ``default_friend_index()``
 
         Returns:
             bool: Whether the friend was found or not.
         """
+        if index is None:
+            index = default_friend_index()
+        owner = self.name or ""
+        key = friend_key(match_img)
+
         if not self.silent_mouse:
             self.set_active()
-        # Check if friends already opened (and close it)
-        friend_icon_area = self.get_image(region=(750, 35, 30, 30))
-        while not match_image(
-            friend_icon_area, packaged_img("friendlist.png"), threshold=0.05
-        ):
-            await self.send_key("F")
-            await self.wait(0.2)
-            friend_icon_area = self.get_image(region=(775, 30, 40, 40))
-
-        # Open friend menu
-        await self.send_key("F")
-        await self.wait(0.2)
+        if not await self._open_friend_list():
+            self.log("Friend list icon not found")
+            return False
 
         # Find friend that matches friend match_img
         found = False
-        last_page = False
-        while (not found) and (not last_page):
-            last_page = not self.pixel_matches_color((775, 328), (206, 44, 24), 50)
-            found = self.locate_on_screen(match_img, region=AREA_FRIENDS, threshold=0.2)
-
-            if (not found) and not last_page:
-                await self.mouse.click(775, 328, duration=0.2)
-                await self.mouse.move_to(775, 328, 0.3)
+        entry = index.get(owner, key)
+        if entry is not None:
+            found = await self._jump_to_friend(match_img, *entry)
+            if not found:
+                self.log("Friend moved, scanning the friend list")
+                index.forget(owner, key)
+                if not await self._open_friend_list():
+                    self.log("Friend list icon not found")
+                    return False
+
+        if not found:
+            page, found = await self._scan_friends(match_img)
+            if found:
+                index.remember(owner, key, page, found[1])
 
         if found is not False:
             _, y = found
 
             # Select friend
-            await self.mouse.click(670, y, duration=0.2, delay=0.5)
+            await self.mouse.click(
+                *self.coords.point(670, y),
+                duration=get_delay("friends.move"),
+                delay=get_delay("friends.select"),
+            )
             # Select port
-            await self.mouse.click(450, 115, duration=0.2, delay=0.5)
+            await self.mouse.click(
+                *self.coords.point(450, 115),
+                duration=get_delay("friends.move"),
+                delay=get_delay("friends.select"),
+            )
             # Select yes
             await self.click_confirm()
-            await self.wait(1)
+            await self.wait(get_delay("friends.teleport"))
 
             return True
         else:
@@ -720,23 +1081,47 @@ class Client(DeviceContext, Keyboard, Window):
     BATTLE ACTIONS & METHODS
     """
 
-    def get_battle(self, name: str = None) -> Battle:
+    def get_battle(self, name: str = None, **kwargs) -> Battle:
         """
         Fetch a ``battle`` associated with the client
 
         Args:
             name (str): Name of battle for logging purposes.
+            kwargs: additional ``Battle`` options (``poll_fast``, ``poll_slow``, ``prefetch``)
 
         Returns:
             Battle: object with battle methods linked to this client
         """
-        return Battle(self, name, default_image_folder=self._default_image_folder)
+        return Battle(
+            self, name, default_image_folder=self._default_image_folder, **kwargs
+        )
+
+    def _spell_path(self, spell_name: str) -> str:
+        """ File name of the image of ``spell_name`` in the spells folder """
+        extensions = [".png", ".jpg", "jpeg", ".bmp"]
+        file_name = spell_name
+        if not spell_name[-4:] in extensions:
+            file_name += ".png"
+
+        return os.path.join(SPELLS_FOLDER, file_name)
+
+    async def _clear_spell_area(self):
+        """ Gets the mouse out of the way before capturing the spells """
+        async with self.mouse.hold():
+            # Move into the window if the window isn't active
+            if not self.silent_mouse and not self.is_active():
+                self.set_active()
+                await self.mouse.move_to(100, 100, duration=0.2)
+            else:
+                # Move mouse out of area to get a clear image
+                await self.mouse.move_out(self.coords.region(AREA_SPELLS))
 
     async def find_spell(
         self, spell_name: str, threshold: float = 0.12, ignore_gray_detection=False
     ) -> Card:
         """
         Searches spell area for an image matching ``spell_name``. An additional check to see if the spell is grayed out is done by default.
+        During a battle round, the spell area is captured once and reused by the following calls (see ``Hand``).
 
         Args:
             spell_name (str): The name of the spell as you have it saved in your spells image folder.
@@ -744,59 +1129,22 @@ class Client(DeviceContext, Keyboard, Window):
             ignore_gray_detection (bool): should the gray detection be ignored. defaults to False
 
         Returns:
-            int: x positions of spell if found, None otherwise
+            Card: the card if found, None otherwise
         """
-        # Move into the window if the window isn't active
-        if not self.silent_mouse and not self.is_active():
-            self.set_active()
-            await self.mouse.move_to(100, 100, duration=0.2)
-        else:
-            # Move mouse out of area to get a clear image
-            await self.mouse.move_out(AREA_SPELLS)
-
-        # Get screenshot of `spell_area`
-        b_spell_area = self.get_image(AREA_SPELLS)
-
-        extensions = [".png", ".jpg", "jpeg", ".bmp"]
-        file_name = spell_name
-        if not spell_name[-4:] in extensions:
-            file_name += ".png"
-
-        spell_path = os.path.join(SPELLS_FOLDER, file_name)
-
-        res = match_image(b_spell_area, spell_path, threshold)
-
-        if res:
-            x, y = res
-            # We're only interested in the x position
-            offset_x = AREA_SPELLS[0]
-            # a card width is 52 pixels, round to the nearest 1/2 card (26 pixels)
-            adjusted_x = round(x / 26) * 26
-
-            spell_pos = offset_x + adjusted_x
-
-            if not ignore_gray_detection:
-                # Check if the card is grayed out
-                grayness = self.is_gray_rect(
-                    (spell_pos - 10, 310, 20, 20), threshold=25
-                )
-                # print(file_name, grayness)
-                if grayness < 25:
-                    if grayness > 20:
-                        print(f"{file_name} was found, but gray was detected.")
-                        print("If this is an error, contact wizSDK dev.")
-                    return None
-
-            return Card(self, spell_name, spell_pos)
-        else:
-            return None
+        return await self.hand.find(spell_name, threshold, ignore_gray_detection)
 
     async def pass_turn(self) -> None:
         """
         Clicks `pass` while in a battle
         """
-        await self.mouse.click(254, 398, duration=0.2, delay=0.5)
-        await self.wait(0.5)
+        await self.click_and_wait(
+            254,
+            398,
+            AREA_TURN_BUTTONS,
+            duration=get_delay("pass.move"),
+            delay=get_delay("pass.hover"),
+            timeout=get_delay("pass.response"),
+        )
 
     async def autocast(self, *spells: str, target=None):
         """
@@ -846,6 +1194,13 @@ class Client(DeviceContext, Keyboard, Window):
         return True
 
 
+def _window_sort_key(win):
+    """ Orders windows from left to right, top to bottom """
+    rect = win.get_rect()
+    round_y = (rect[1] // 100) * 100
+    return rect[0] + (round_y * 10)
+
+
 def register_clients(
     n_handles_expected: int,
     names: list = [],
@@ -889,12 +1244,126 @@ def register_clients(
         ]
 
         # Sort
-        def sort_func(win):
-            rect = win.get_rect()
-            round_y = (rect[1] // 100) * 100
-            return rect[0] + (round_y * 10)
+        w.sort(key=_window_sort_key)
+
+        # Set names
+        for i in range(len(w)):
+            if i < len(names):
+                w[i].set_name(names[i])
+
+        # Confirm position
+        if confirm_position:
+            print("Is this order ok?")
+            answer = input("[y] or n: ")
+            if answer.lower().strip()[0] == "y" or answer == "":
+                accepted = True
+            else:
+                print("Re-order the windows")
+                os.system("pause")
+        else:
+            accepted = True
+
+    # Returns the sorted clients in an array
+    return w
+
+
+async def register_clients_async(
+    n_handles_expected: int,
+    names: list = [],
+    confirm_position: bool = False,
+    silent_mouse: bool = False,
+    *,
+    activate_hooks: bool = True,
+    max_concurrency: int = 4,
+) -> list:
+    """
+    Register multiple clients concurrently, sorted from left to right, top to bottom.
+    Window handles are discovered once, then the clients are attached and their hooks activated
+    at the same time (``max_concurrency`` at most). The time taken by every client is logged.
+    Clients that fail to register or to activate their hooks are logged and left out of the returned list.
+
+    Args:
+        n_handles_expected (int): the expected # of wiz windows opened. Use -1 for undetermined
+        names (list): A list of strings that will serve as the names of the windows
+        confirm_position (bool): prompt the user to confirm the windows order before continuing
+        silent_mouse: When enabled, moves the mouse without taking control of the actual cursor
+        activate_hooks (bool): attach wizwalker and activate the hooks of every client. Otherwise wizwalker is attached on first use. Defaults to True
+        max_concurrency (int): maximum number of clients registering at the same time. Defaults to 4
+
+    Returns:
+        client_list (list): A list populated with ``Client`` instances
 
-        w.sort(key=sort_func)
+    Examples:
+        .. code-block:: py
+
+            async def main():
+                p1, p2, p3, p4 = await register_clients_async(4, ["P1", "P2", "P3", "P4"])
+    """
+    loop = asyncio.get_event_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    timings = {}
+
+    async def _register(handle):
+        async with semaphore:
+            start = time.perf_counter()
+            # Attaching wizwalker is blocking, run it in a thread
+            client = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    Client.register,
+                    handle=handle,
+                    silent_mouse=silent_mouse,
+                    lazy_walker=not activate_hooks,
+                ),
+            )
+            timings[handle] = time.perf_counter() - start
+            return client
+
+    async def _activate(client):
+        async with semaphore:
+            start = time.perf_counter()
+            if silent_mouse:
+                await client.activate_all_hooks()
+            else:
+                await client.activate_hooks()
+            return time.perf_counter() - start
+
+    async def _drop(client):
+        with suppress(Exception):
+            await client.unregister()
+        with suppress(ValueError):
+            all_clients.remove(client)
+
+    accepted = False
+    while not accepted:
+        handles = get_all_wiz_handles()
+        n_handles = len(handles)
+
+        if n_handles != n_handles_expected and n_handles_expected > 0:
+            print(
+                f"Invalid number of windows open. {n_handles_expected} required, {n_handles} detected."
+            )
+            os.system("pause")
+            exit()
+        else:
+            print(f"{n_handles} windows detected")
+
+        # Fill names array if necessary
+        for i in range(n_handles - len(names)):
+            names.append(None)
+
+        results = await asyncio.gather(
+            *[_register(handle) for handle in handles], return_exceptions=True
+        )
+
+        w = []
+        for handle, result in zip(handles, results):
+            if isinstance(result, Exception):
+                print(f"Failed to register window {handle}: {result!r}")
+            else:
+                w.append(result)
+
+        w.sort(key=_window_sort_key)
 
         # Set names
         for i in range(len(w)):
@@ -909,9 +1378,31 @@ def register_clients(
                 accepted = True
             else:
                 print("Re-order the windows")
+                for client in w:
+                    await _drop(client)
                 os.system("pause")
         else:
             accepted = True
 
+    hook_timings = {}
+    if activate_hooks:
+        results = await asyncio.gather(
+            *[_activate(client) for client in w], return_exceptions=True
+        )
+
+        for client, result in zip(list(w), results):
+            if isinstance(result, Exception):
+                client.log(f"Failed to activate hooks: {result!r}")
+                w.remove(client)
+                await _drop(client)
+            else:
+                hook_timings[client] = result
+
+    for client in w:
+        message = f"Registered in {timings[client.window_handle]:.2f}s"
+        if client in hook_timings:
+            message += f", hooks activated in {hook_timings[client]:.2f}s"
+        client.log(message)
+
     # Returns the sorted clients in an array
     return w
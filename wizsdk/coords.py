@@ -0,0 +1,145 @@
+# Native imports
+import functools
+
+# Third-party imports
+import cv2
+
+# Custom imports
+from .pixels import load_image, scaled_template
+
+CANONICAL_SIZE = (800, 600)
+""" Client size every coordinate of wizSDK is written for """
+
+
+class CoordinateSpace:
+    """
+    Maps coordinates written for an 800x600 client (``CANONICAL_SIZE``) to the actual size of a client.
+    Coordinates stay relative to the window: the client area is scaled around its top left corner,
+    and the window borders are left as is. Scaled regions, points and templates are cached.
+
+    Get the space of a window with ``coordinate_space`` (or ``Client.coords``), so it is shared by every
+    window of the same size.
+
+    Example:
+        .. code-block:: py
+
+            coords = player.coords
+            image = player.get_image(coords.region(AREA_SPELLS))
+            template = coords.template("spells/tempest.png")
+    """
+
+    def __init__(self, client_area: tuple):
+        """
+        Args:
+            client_area: (x, y, width, height) of the client area, relative to the window
+        """
+        self.client_area = client_area
+        self.left, self.top, width, height = client_area
+        self.scale_x = width / CANONICAL_SIZE[0]
+        self.scale_y = height / CANONICAL_SIZE[1]
+        self.is_identity = (width, height) == CANONICAL_SIZE
+
+        self._points = {}
+        self._regions = {}
+        self._templates = {}
+
+    def point(self, x, y) -> tuple:
+        """
+        Maps a canonical (x, y) position to the client
+        """
+        if self.is_identity:
+            return x, y
+
+        key = (x, y)
+        if key not in self._points:
+            self._points[key] = (
+                round(self.left + (x - self.left) * self.scale_x),
+                round(self.top + (y - self.top) * self.scale_y),
+            )
+        return self._points[key]
+
+    def to_canonical(self, x, y) -> tuple:
+        """
+        Maps an (x, y) position of the client back to canonical coordinates
+        """
+        if self.is_identity:
+            return x, y
+
+        return (
+            round(self.left + (x - self.left) / self.scale_x),
+            round(self.top + (y - self.top) / self.scale_y),
+        )
+
+    def region(self, region: tuple) -> tuple:
+        """
+        Maps a canonical (x, y, width, height) region to the client
+        """
+        if self.is_identity or region is None:
+            return region
+
+        if region not in self._regions:
+            x, y, w, h = region
+            x1, y1 = self.point(x, y)
+            x2, y2 = self.point(x + w, y + h)
+            self._regions[region] = (x1, y1, max(1, x2 - x1), max(1, y2 - y1))
+        return self._regions[region]
+
+    def size(self, region: tuple) -> tuple:
+        """
+        Scales an (x, y, width, height) region relative to another region (a crop of a capture)
+        """
+        if self.is_identity:
+            return region
+
+        x, y, w, h = region
+        return (
+            round(x * self.scale_x),
+            round(y * self.scale_y),
+            max(1, round(w * self.scale_x)),
+            max(1, round(h * self.scale_y)),
+        )
+
+    def template(self, template, scale: float = 1):
+        """
+        Scales a template (file name or numpy array) to the client, and to captures made with ``get_image(scale=scale)``.
+        File names are cached by (file name, scale), so both scales are applied with a single resize.
+
+        Returns:
+            the template itself if the client has the canonical size and ``scale`` is 1, the scaled numpy array otherwise
+        """
+        if self.is_identity:
+            return scaled_template(template, scale)
+
+        cacheable = isinstance(template, str)
+        key = (template, scale)
+        if cacheable and key in self._templates:
+            return self._templates[key]
+
+        image = load_image(template) if cacheable else template
+        h, w = image.shape[:2]
+        scaled = cv2.resize(
+            image,
+            (
+                max(1, round(w * self.scale_x * scale)),
+                max(1, round(h * self.scale_y * scale)),
+            ),
+            interpolation=cv2.INTER_AREA,
+        )
+        if cacheable:
+            self._templates[key] = scaled
+        return scaled
+
+    def __repr__(self):
+        return f"CoordinateSpace({self.client_area}, scale=({self.scale_x:.2f}, {self.scale_y:.2f}))"
+
+
+@functools.lru_cache(maxsize=32)
+def _coordinate_space(client_area: tuple) -> CoordinateSpace:
+    return CoordinateSpace(client_area)
+
+
+def coordinate_space(window) -> CoordinateSpace:
+    """
+    Returns the ``CoordinateSpace`` of a window, shared by every window with the same client area
+    """
+    return _coordinate_space(window.get_client_area())
@@ -0,0 +1,167 @@
+# Native imports
+import time
+import asyncio
+
+# Custom imports
+from .ui_state import UI_DETECTORS, AREA_PRESS_X
+from .pixels import crop, frame_difference
+from .timing import get_delay
+
+PRESS_X = "press_x"
+MORE = "more"
+NONE = "none"
+
+# rectangles defined as (x, y, width, height)
+AREA_DIALOG = (100, 480, 600, 150)
+
+POLL_INTERVAL = 0.05
+""" Time in seconds between two captures while waiting for a dialog """
+
+SETTLE_TIME = 0.75
+""" Time in seconds without the "more" button for a dialog to be considered over, unless the "press x" prompt shows up. Covers the gap between two pages """
+
+CHANGE_THRESHOLD = 6
+""" Average difference per channel for the "press x" prompt to be considered changed, see ``frame_difference`` """
+
+
+def classify_dialog(image, coords=None) -> str:
+    """
+    Classifies a capture of the whole window
+
+    Args:
+        image: the capture
+        coords (optional): ``CoordinateSpace`` of the captured window. Defaults to an 800x600 client
+
+    Returns:
+        ``MORE`` if the "more" / "done" button of a dialog is visible, ``PRESS_X`` for the "press x" prompt, ``NONE`` otherwise
+    """
+    if UI_DETECTORS["dialog_more"].matches(image, coords):
+        return MORE
+    if UI_DETECTORS["press_x"].matches(image, coords):
+        return PRESS_X
+    return NONE
+
+
+class DialogDriver:
+    """
+    Goes through NPC dialogs. Every frame is captured and classified once, and keys are sent
+    as soon as the prompt shows up. After a key, the driver waits for the dialog to react instead
+    of sleeping a fixed delay.
+
+    Example:
+        .. code-block:: py
+
+            driver = DialogDriver(player)
+            # Hand in the quest, then get the next one
+            await driver.run(2)
+            print(f"{driver.pages} pages, {driver.rate:.1f} dialogs/s")
+    """
+
+    def __init__(self, client, interval: float = POLL_INTERVAL, capture=None):
+        """
+        Args:
+            client: the ``Client`` talking to the NPC
+            interval (float, optional): time in seconds between two captures. Defaults to ``POLL_INTERVAL``
+            capture (SharedCapture, optional): shared capture of the client's window. Defaults to None (capture the window alone)
+        """
+        self.client = client
+        self.interval = interval
+        self.capture = capture
+        self.dialogs = 0
+        self.pages = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self) -> float:
+        """
+        Dialogs advanced per second during the last ``run``
+        """
+        if not self.elapsed:
+            return 0.0
+        return self.dialogs / self.elapsed
+
+    def _capture(self):
+        """ Captures the whole window, from the shared capture if there is one """
+        if self.capture is None:
+            return self.client.get_image()
+        return self.capture.view(self.client, max_age=self.interval)
+
+    async def _send(self, key, region) -> bool:
+        """
+        Sends ``key`` and waits for ``region`` to react
+
+        Returns:
+            True if the region changed
+        """
+        reference = self.client.get_image(region)
+        await self.client.send_key(key, get_delay("dialog.key"))
+        return await self.client.wait_for_change(
+            region,
+            get_delay("dialog.response"),
+            reference=reference,
+            threshold=CHANGE_THRESHOLD,
+            interval=self.interval,
+        )
+
+    async def run(self, times: int = 1):
+        """
+        Waits for a "press x" prompt or a dialog, and goes through it. Repeats ``times`` times.
+
+        Args:
+            times (int, optional): number of dialogs to go through. Defaults to 1
+        """
+        self.dialogs = 0
+        self.pages = 0
+        start = time.monotonic()
+
+        coords = self.client.coords
+        dialog_area = coords.region(AREA_DIALOG)
+        press_x_area = coords.region(AREA_PRESS_X)
+
+        in_dialog = False
+        empty_since = None
+        # The "press x" prompt as it was when an X got no reaction
+        ignored_prompt = None
+
+        try:
+            while self.dialogs < times:
+                image = self._capture()
+                state = classify_dialog(image, coords)
+
+                if state != NONE:
+                    empty_since = None
+                if state != PRESS_X:
+                    ignored_prompt = None
+
+                if state == MORE:
+                    in_dialog = True
+                    await self._send("SPACEBAR", dialog_area)
+                    self.pages += 1
+                    continue
+
+                if in_dialog:
+                    # The "more" button went away. The "press x" prompt only comes back once the dialog closed,
+                    # otherwise it may just be the gap between two pages
+                    now = time.monotonic()
+                    if empty_since is None:
+                        empty_since = now
+                    if state == PRESS_X or now - empty_since >= SETTLE_TIME:
+                        self.dialogs += 1
+                        in_dialog = False
+                        empty_since = None
+                        continue
+
+                elif state == PRESS_X and self.dialogs < times:
+                    prompt = crop(image, press_x_area)
+                    if (
+                        ignored_prompt is None
+                        or frame_difference(ignored_prompt, prompt) > CHANGE_THRESHOLD
+                    ):
+                        # Only send X again once the prompt changed
+                        changed = await self._send("X", press_x_area)
+                        ignored_prompt = None if changed else prompt
+                        continue
+
+                await asyncio.sleep(self.interval)
+        finally:
+            self.elapsed = time.monotonic() - start
@@ -0,0 +1,311 @@
+# Native imports
+import asyncio
+import inspect
+import re
+import time
+from collections import namedtuple
+
+ClientEvent = namedtuple("ClientEvent", "name value timestamp")
+"""
+Event published by ``ClientEvents``. ``value`` holds the new value of the watched state.
+
+:meta private:
+"""
+
+BATTLE_STARTED = "battle_started"
+BATTLE_ENDED = "battle_ended"
+ZONE_CHANGED = "zone_changed"
+MOVE_LOCK_CHANGED = "move_lock_changed"
+
+_THRESHOLD_EVENT = re.compile(r"^(hp|mana)_below\((\d+(?:\.\d+)?)\)$")
+
+
+def hp_below(value) -> str:
+    """
+    Name of the event published when the player's health drops below ``value``
+    """
+    return f"hp_below({value})"
+
+
+def mana_below(value) -> str:
+    """
+    Name of the event published when the player's mana drops below ``value``
+    """
+    return f"mana_below({value})"
+
+
+class ClientEvents:
+    """
+    Edge-triggered event bus for a client. A single background task polls the client's memory
+    and publishes an event every time a watched state changes, so any number of coroutines can
+    react to it without reading the memory themselves.
+
+    Events:
+        ``battle_started``, ``battle_ended``, ``zone_changed``, ``move_lock_changed``,
+        ``hp_below(x)`` and ``mana_below(x)`` (see ``hp_below`` and ``mana_below``)
+
+    Example:
+        .. code-block:: py
+
+            player = Client.register(name="Bot")
+            await player.activate_hooks()
+            player.events.start()
+
+            # Wait for the fight to be over
+            await player.events.wait_for("battle_ended", timeout=60)
+
+            # React to low health
+            player.events.on(player.events.hp_below(500), lambda e: print(e.value))
+    """
+
+    def __init__(self, client, interval: float = 0.25):
+        """
+        Args:
+            client: The ``Client`` to watch
+            interval (float, optional): seconds between two polls. Defaults to 0.25
+        """
+        self.client = client
+        self.interval = interval
+
+        self._task = None
+        self._listeners = {}
+        self._waiters = {}
+        self._queues = []
+        self._thresholds = {"hp": {}, "mana": {}}
+
+        self._state = {}
+        self._last_poll = 0
+
+    # Helpers to build threshold event names
+    hp_below = staticmethod(hp_below)
+    mana_below = staticmethod(mana_below)
+
+    @property
+    def running(self) -> bool:
+        """
+        True if the background poller is running
+        """
+        return self._task is not None and not self._task.done()
+
+    @property
+    def in_battle(self):
+        """ Last polled battle state, None if it hasn't been read yet """
+        return self._state.get("in_battle")
+
+    @property
+    def zone(self):
+        """ Last polled zone name, None if it hasn't been read yet """
+        return self._state.get("zone")
+
+    @property
+    def move_locked(self):
+        """ Last polled move lock state, None if it hasn't been read yet """
+        return self._state.get("move_lock")
+
+    @property
+    def health(self):
+        """ Last polled health value, None if it hasn't been read yet """
+        return self._state.get("hp")
+
+    @property
+    def mana(self):
+        """ Last polled mana value, None if it hasn't been read yet """
+        return self._state.get("mana")
+
+    def start(self):
+        """
+        Starts the background poller if it isn't running already. Must be called from a running event loop.
+        """
+        if not self.running:
+            self._task = asyncio.create_task(self._poll_loop())
+        return self
+
+    async def stop(self):
+        """
+        Stops the background poller. Can be called from another event loop (the console ctrl handler), the poller is then only cancelled.
+        """
+        if self.running:
+            loop = self._task.get_loop()
+            if loop is not asyncio.get_running_loop():
+                # The poller can't be awaited from another loop
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._task.cancel)
+                self._task = None
+                return
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def on(self, name: str, callback):
+        """
+        Calls ``callback`` every time the event ``name`` is published.
+        ``callback`` receives the ``ClientEvent`` and can be a function or a coroutine function.
+
+        Args:
+            name (str): name of the event
+            callback: function called with the event
+        """
+        self._watch(name)
+        self._listeners.setdefault(name, []).append(callback)
+        return callback
+
+    def off(self, name: str, callback):
+        """
+        Removes a callback added with ``on``
+        """
+        with_name = self._listeners.get(name, [])
+        if callback in with_name:
+            with_name.remove(callback)
+
+    def subscribe(self, *names: str) -> asyncio.Queue:
+        """
+        Returns a queue that receives every event in ``names`` (all events if none are specified).
+
+        Examples:
+            .. code-block:: py
+
+                queue = player.events.subscribe("battle_started", "battle_ended")
+                while True:
+                    event = await queue.get()
+                    print(event.name)
+        """
+        for name in names:
+            self._watch(name)
+        queue = asyncio.Queue()
+        self._queues.append((set(names), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """
+        Stops sending events to a queue returned by ``subscribe``
+        """
+        self._queues = [(n, q) for n, q in self._queues if q is not queue]
+
+    async def wait_for(self, name: str, *, timeout=None):
+        """
+        Waits for the next time the event ``name`` is published. Starts the poller if necessary.
+
+        Args:
+            name (str): name of the event
+            timeout (optional): value in seconds to timeout if it hasn't happened yet. Defaults to None
+
+        Returns:
+            The ``ClientEvent`` that was published, False if the function timed out.
+        """
+        self._watch(name)
+        self.start()
+
+        future = asyncio.get_event_loop().create_future()
+        self._waiters.setdefault(name, []).append(future)
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with_name = self._waiters.get(name, [])
+            if future in with_name:
+                with_name.remove(future)
+
+    async def read(self, key: str, max_age: float = None):
+        """
+        Returns a watched value ("in_battle", "zone", "move_lock", "hp" or "mana"). The last polled
+        value is used if it's recent enough, otherwise the client is polled right away (publishing any change).
+
+        Args:
+            key (str): the state to read
+            max_age (float, optional): how old the polled value can be, in seconds. Defaults to the poll interval
+        """
+        if max_age is None:
+            max_age = self.interval
+
+        if key not in self._state or time.monotonic() - self._last_poll > max_age:
+            await self.poll()
+
+        return self._state.get(key)
+
+    async def poll(self):
+        """
+        Reads the client's state once and publishes the changes since the last poll
+        """
+        walker = self.client.walker
+        keys = ["in_battle", "zone", "move_lock", "hp", "mana"]
+        values = await asyncio.gather(
+            walker.in_battle(),
+            walker.zone_name(),
+            walker.move_lock(),
+            walker.stats.current_hitpoints(),
+            walker.stats.current_mana(),
+            return_exceptions=True,
+        )
+
+        new_state = {
+            k: v for k, v in zip(keys, values) if not isinstance(v, Exception)
+        }
+        old_state = self._state
+        self._state = {**old_state, **new_state}
+        self._last_poll = time.monotonic()
+
+        for name, value in self._edges(old_state, new_state):
+            await self._publish(name, value)
+
+        return self._state
+
+    def _edges(self, old, new):
+        """ Yields (name, value) for every transition between two polls """
+
+        def changed(key):
+            return key in old and key in new and old[key] != new[key]
+
+        if changed("in_battle"):
+            yield (BATTLE_STARTED if new["in_battle"] else BATTLE_ENDED), True
+
+        if changed("zone"):
+            yield ZONE_CHANGED, new["zone"]
+
+        if changed("move_lock"):
+            yield MOVE_LOCK_CHANGED, new["move_lock"]
+
+        for stat in ("hp", "mana"):
+            if not changed(stat):
+                continue
+            for name, threshold in self._thresholds[stat].items():
+                if new[stat] < threshold <= old[stat]:
+                    yield name, new[stat]
+
+    async def _publish(self, name, value):
+        event = ClientEvent(name, value, time.monotonic())
+
+        for future in self._waiters.pop(name, []):
+            if not future.done():
+                future.set_result(event)
+
+        for names, queue in self._queues:
+            if not names or name in names:
+                queue.put_nowait(event)
+
+        for callback in list(self._listeners.get(name, [])):
+            result = callback(event)
+            if inspect.isawaitable(result):
+                await result
+
+    def _watch(self, name):
+        """ Registers the threshold of ``hp_below(x)`` and ``mana_below(x)`` events """
+        match = _THRESHOLD_EVENT.match(name)
+        if match:
+            stat, threshold = match.groups()
+            self._thresholds[stat][name] = float(threshold)
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.client.log(f"Event poll failed: {e}")
+
+            await asyncio.sleep(self.interval)
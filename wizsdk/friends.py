@@ -0,0 +1,99 @@
+# Native imports
+import hashlib
+import json
+import os
+
+
+def friend_key(match_img) -> str:
+    """
+    Key of a friend icon in a ``FriendIndex``: the file name, or a hash of the pixels for a numpy array
+    """
+    if isinstance(match_img, str):
+        return match_img
+
+    digest = hashlib.sha1(str(match_img.shape).encode())
+    digest.update(match_img.tobytes())
+    return f"sha1:{digest.hexdigest()}"
+
+
+class FriendIndex:
+    """
+    Remembers the page and the row of the friend list each friend icon was last found on,
+    so ``Client.teleport_to_friend`` can jump there instead of scanning every page.
+    Entries are stored per client name, since each account has its own friend list.
+
+    Example:
+        .. code-block:: py
+
+            # Kept in memory for the session
+            index = FriendIndex()
+            # Or remembered between sessions
+            index = FriendIndex("friends.json")
+            # First call scans the list, the next ones jump to the right page
+            await p1.teleport_to_friend("friend-icon.png", index=index)
+    """
+
+    def __init__(self, path: str = None, autosave: bool = True):
+        """
+        Args:
+            path (str, optional): json file to read and write the index to. Defaults to None (kept in memory only)
+            autosave (bool, optional): write the file every time an entry changes. Defaults to True
+        """
+        self.path = path
+        self.autosave = autosave
+        self._entries = {}
+
+        if path and os.path.isfile(path):
+            with open(path) as f:
+                self._entries = json.load(f)
+
+    def get(self, owner: str, key: str):
+        """
+        Returns the (page, y) where the friend ``key`` was last found by ``owner``, None if unknown
+        """
+        entry = self._entries.get(owner, {}).get(key)
+        if entry is None:
+            return None
+        return entry["page"], entry["y"]
+
+    def remember(self, owner: str, key: str, page: int, y: int):
+        """
+        Records that ``owner`` found the friend ``key`` on ``page`` (starting at 1), at the height ``y``
+        """
+        entry = {"page": page, "y": y}
+        if self._entries.get(owner, {}).get(key) != entry:
+            self._entries.setdefault(owner, {})[key] = entry
+            self._changed()
+
+    def forget(self, owner: str, key: str):
+        """
+        Removes an outdated entry
+        """
+        if self._entries.get(owner, {}).pop(key, None) is not None:
+            self._changed()
+
+    def save(self):
+        """
+        Writes the index to its file
+        """
+        if self.path:
+            with open(self.path, "w") as f:
+                json.dump(self._entries, f, indent=2)
+
+    def _changed(self):
+        if self.autosave:
+            self.save()
+
+
+_default_index = None
+
+
+def default_friend_index() -> FriendIndex:
+    """
+    Returns the index used when ``Client.teleport_to_friend`` isn't given one. It is kept in memory only,
+    pass a ``FriendIndex`` with a path to remember friends between sessions.
+    """
+    global _default_index
+    if _default_index is None:
+        _default_index = FriendIndex()
+    return _default_index
@@ -0,0 +1,262 @@
+# Native imports
+import asyncio
+from contextlib import suppress
+
+# Custom imports
+from .pixels import match_image, match_image_all, gray_level, crop
+from .card import Card
+
+CARD_WIDTH = 52
+# Cards are matched to the nearest 1/2 card
+HALF_CARD = CARD_WIDTH // 2
+
+
+class Hand:
+    """
+    Model of the spells in hand during a battle round.
+    The spell area is captured once per round, then every lookup is matched against that capture.
+    Positions are updated when cards are enchanted, cast or discarded, and spells that weren't found
+    are remembered until the end of the round.
+
+    Outside of a battle round (``begin_round`` is called by ``Battle.loop``), every lookup captures the spell area again.
+
+    Example:
+        .. code-block:: py
+
+            while await battle.loop():
+                # Captures the hand
+                epic = await player.find_spell("epic")
+                # Matched against the same capture
+                tempest = await player.find_spell("tempest")
+                if epic and tempest:
+                    # The positions of the other cards are updated
+                    e_tempest = await epic.enchant(tempest)
+                    await e_tempest.cast()
+    """
+
+    def __init__(self, client, area: tuple):
+        """
+        Args:
+            client: the ``Client`` holding the cards
+            area: (x, y, width, height) rectangle of the spells, in canonical coordinates (see ``Client.coords``)
+        """
+        self.client = client
+        self.area = area
+
+        self._in_round = False
+        self._image = None
+        # original x of cards that left the hand
+        self._removed = []
+        # original x -> name of enchanted cards
+        self._renamed = {}
+        self._misses = set()
+        self._found = {}
+        self._prefetch_task = None
+        self.scans = 0
+
+    @property
+    def valid(self) -> bool:
+        """
+        True if the hand has been scanned and can be used for lookups
+        """
+        return self._image is not None
+
+    def begin_round(self):
+        """
+        Starts a new round: the next lookup scans the hand, the following ones reuse that scan.
+        """
+        self.invalidate()
+        self._in_round = True
+
+    def end_round(self):
+        """
+        Ends the round: lookups capture the spell area every time until the next ``begin_round``.
+        """
+        self.invalidate()
+        self._in_round = False
+
+    def invalidate(self):
+        """
+        Forgets the scan, the card movements and the spells that weren't found.
+        Call it if cards are drawn during the round.
+        """
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+
+        self._image = None
+        self._removed = []
+        self._renamed = {}
+        self._misses = set()
+        self._found = {}
+
+    def prefetch(self, *spell_names: str, threshold: float = 0.12):
+        """
+        Scans the hand in the background and looks up ``spell_names``, so the next ``find`` calls for them resolve instantly.
+        Only available during a battle round.
+
+        Args:
+            spell_names: the spells likely to be used this round
+            threshold (float): How precise the match should be. See ``Client.find_spell``
+        """
+        if not self._in_round or self._prefetch_task is not None:
+            return
+
+        self._prefetch_task = asyncio.create_task(
+            self._prefetch(spell_names, threshold)
+        )
+
+    async def wait_prefetch(self):
+        """
+        Waits for a prefetch started with ``prefetch`` to be done. Called before mouse actions so they don't fight over the cursor.
+        """
+        task = self._prefetch_task
+        if task is not None:
+            with suppress(asyncio.CancelledError):
+                await task
+            if self._prefetch_task is task:
+                self._prefetch_task = None
+
+    async def _prefetch(self, spell_names, threshold):
+        if self._image is None:
+            await self.scan()
+
+        for spell_name in spell_names:
+            key = (spell_name, threshold, False)
+            card = self._lookup(spell_name, threshold, False)
+            self._found[key] = card
+            if card is None:
+                self._misses.add(key)
+
+    async def scan(self):
+        """
+        Captures the spell area
+        """
+        await self.client._clear_spell_area()
+        self._image = self.client.get_image(self.client.coords.region(self.area))
+        self._removed = []
+        self._renamed = {}
+        self._misses = set()
+        self._found = {}
+        self.scans += 1
+        return self
+
+    def current_x(self, original_x: int) -> int:
+        """
+        Position of a card that was at ``original_x`` when the hand was scanned.
+        Cards are centered, so every card that leaves the hand moves the ones on its left
+        by half a card to the right, and the ones on its right by half a card to the left.
+        """
+        left = sum(1 for x in self._removed if x < original_x)
+        right = sum(1 for x in self._removed if x > original_x)
+        return original_x + (right - left) * HALF_CARD
+
+    def remove(self, card: Card):
+        """
+        Removes a card cast, discarded or used as an enchantment
+        """
+        if card.original_x is not None and card.original_x not in self._removed:
+            self._removed.append(card.original_x)
+
+    def rename(self, card: Card, name: str):
+        """
+        Registers a card as enchanted. It won't match its former spell anymore.
+        """
+        if card.original_x is not None:
+            self._renamed[card.original_x] = name
+
+    async def find(
+        self, spell_name: str, threshold: float = 0.12, ignore_gray_detection=False
+    ) -> Card:
+        """
+        Looks for ``spell_name`` in the hand. See ``Client.find_spell``
+
+        Returns:
+            Card: the card if found, None otherwise
+        """
+        key = (spell_name, threshold, ignore_gray_detection)
+        await self.wait_prefetch()
+
+        if not self._in_round:
+            self.invalidate()
+        elif key in self._misses:
+            return None
+
+        card = self._found.get(key)
+        if card is not None and self._in_hand(card.original_x):
+            return card
+
+        if self._image is None:
+            await self.scan()
+
+        card = self._lookup(spell_name, threshold, ignore_gray_detection)
+
+        if card is None and self._in_round:
+            self._misses.add(key)
+
+        return card
+
+    def verify(self, card: Card, threshold: float = 0.12) -> bool:
+        """
+        Captures the card's position and checks it still shows the card's spell.
+        The hand is invalidated if it doesn't.
+
+        Returns:
+            bool: True if the card is where the hand expects it
+        """
+        coords = self.client.coords
+        region = (card.spell_x - HALF_CARD, self.area[1], CARD_WIDTH, self.area[3])
+        found = match_image(
+            self.client.get_image(coords.region(region)),
+            coords.template(self.client._spell_path(card.name)),
+            threshold,
+        )
+
+        if not found:
+            self.invalidate()
+        return bool(found)
+
+    def _in_hand(self, original_x):
+        """ False if the card scanned at ``original_x`` left the hand or was enchanted """
+        return original_x not in self._removed and original_x not in self._renamed
+
+    def _lookup(self, spell_name, threshold, ignore_gray_detection):
+        coords = self.client.coords
+        file_name = self.client._spell_path(spell_name)
+        offset_x = self.area[0]
+        checked = set()
+
+        for x, y in match_image_all(self._image, coords.template(file_name), threshold):
+            # a card width is 52 pixels, round to the nearest 1/2 card (26 pixels)
+            adjusted_x = round(x / coords.scale_x / HALF_CARD) * HALF_CARD
+            original_x = offset_x + adjusted_x
+
+            if original_x in checked:
+                continue
+            checked.add(original_x)
+
+            if not self._in_hand(original_x):
+                continue
+
+            if not ignore_gray_detection:
+                # Check if the card is grayed out
+                grayness = gray_level(
+                    crop(
+                        self._image, coords.size((max(adjusted_x - 10, 0), 20, 20, 20)),
+                    )
+                )
+                if grayness < 25:
+                    if grayness > 20:
+                        print(f"{file_name} was found, but gray was detected.")
+                        print("If this is an error, contact wizSDK dev.")
+                    continue
+
+            return Card(
+                self.client,
+                spell_name,
+                self.current_x(original_x),
+                hand=self,
+                original_x=original_x,
+            )
+
+        return None
@@ -0,0 +1,207 @@
+# Native imports
+import time
+import asyncio
+from collections import namedtuple
+
+# Third-party imports
+import numpy as np
+
+# Custom imports
+from .ui_state import UI_DETECTORS
+
+BLACK = "black"
+LOADING = "loading"
+SCENE = "scene"
+WORLD = "world"
+
+SAMPLE_STEP = 8
+""" Only one pixel out of ``SAMPLE_STEP`` is sampled in each direction """
+
+BLACK_BRIGHTNESS = 12
+""" Frames darker than this (0-255) on average are black screens """
+
+BLACK_DEVIATION = 6
+""" Black screens have almost no contrast: brightness standard deviation below this """
+
+STATIC_DIFFERENCE = 2.0
+""" Loading screens are still pictures: average brightness difference (0-255) with the previous frame below this """
+
+CAPTURE_SCALE = 0.25
+""" ``LoadingFrame.capture`` captures the window downsampled to this scale """
+
+POLL_INTERVAL = 0.05
+""" Time in seconds between two captures while waiting for a loading screen """
+
+SETTLE_TIME = 1.0
+""" Time in seconds the world must keep moving without the spellbook (a dialog or a battle on arrival) to be considered loaded """
+
+START_TIMEOUT = 3.0
+""" Time in seconds after which ``Client.finish_loading`` considers a client that never showed a loading screen already loaded """
+
+LOADING_TIMEOUT = 60.0
+""" Time in seconds after which ``wait_loaded`` gives up on the clients still loading """
+
+
+class LoadingFrame(
+    namedtuple("LoadingFrame", "state brightness deviation difference sample timestamp")
+):
+    """
+    Classification of a capture of the whole window: ``BLACK``, ``LOADING``, ``SCENE`` or ``WORLD``.
+
+    The frame is downscaled to a grayscale sample, and classified from its statistics:
+
+    - ``BLACK``: dark on average, with almost no contrast
+    - ``LOADING``: a still picture, almost identical to the previous frame, without the spellbook
+    - ``SCENE``: the world is moving, but the spellbook is hidden (dialog, battle, menus)
+    - ``WORLD``: the spellbook (the ``idle`` detector) is visible
+
+    Attributes:
+        state (str): ``"black"``, ``"loading"``, ``"scene"`` or ``"world"``
+        brightness (float): average brightness of the frame, between 0 and 255
+        deviation (float): standard deviation of the brightness
+        difference (float): average brightness difference with the previous frame, None without one
+        sample: the downscaled grayscale sample, compared to the next frame
+        timestamp (float): ``time.monotonic()`` of the capture
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_image(
+        cls,
+        image,
+        timestamp=None,
+        *,
+        previous=None,
+        step=SAMPLE_STEP,
+        detect_world=True,
+        coords=None,
+    ) -> "LoadingFrame":
+        """
+        Classifies a full window capture returned by ``get_image``
+
+        Args:
+            image: the capture
+            timestamp (optional): ``time.monotonic()`` value of the capture. Defaults to now
+            previous (LoadingFrame, optional): the previous frame of the same window. Without it, frames that
+                are neither black nor ``WORLD`` are ``LOADING``
+            step (optional): only one pixel out of ``step`` is sampled in each direction. Defaults to ``SAMPLE_STEP``
+            detect_world (optional): look for the spellbook in ``image``. Defaults to True
+            coords (optional): ``CoordinateSpace`` of the captured window. Defaults to an 800x600 client
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        if len(image) == 0:
+            return cls(BLACK, 0.0, 0.0, None, None, timestamp)
+
+        sample = image[::step, ::step, :3].mean(axis=2, dtype=np.float32)
+        brightness, deviation = float(sample.mean()), float(sample.std())
+
+        difference = None
+        if previous is not None and previous.sample is not None:
+            if previous.sample.shape == sample.shape:
+                difference = float(np.abs(sample - previous.sample).mean())
+            else:
+                # The window was resized
+                difference = 255.0
+
+        if brightness < BLACK_BRIGHTNESS and deviation < BLACK_DEVIATION:
+            state = BLACK
+        elif detect_world and UI_DETECTORS["idle"].matches(image, coords):
+            state = WORLD
+        elif difference is not None and difference >= STATIC_DIFFERENCE:
+            state = SCENE
+        else:
+            state = LOADING
+
+        return cls(state, brightness, deviation, difference, sample, timestamp)
+
+    @classmethod
+    def capture(cls, device_context, previous=None) -> "LoadingFrame":
+        """
+        Captures the window of ``device_context`` downsampled to ``CAPTURE_SCALE`` and classifies it.
+        The spellbook is only captured (at full resolution) when the frame isn't black.
+
+        Args:
+            device_context: the window to capture
+            previous (LoadingFrame, optional): the previous frame of the window, see ``from_image``
+        """
+        frame = cls.from_image(
+            device_context.get_image(scale=CAPTURE_SCALE),
+            previous=previous,
+            step=max(1, round(SAMPLE_STEP * CAPTURE_SCALE)),
+            detect_world=False,
+        )
+        if frame.state != BLACK and UI_DETECTORS["idle"].check(device_context):
+            frame = frame._replace(state=WORLD)
+        return frame
+
+    @property
+    def is_loading(self) -> bool:
+        """ True on black and loading screens """
+        return self.state in (BLACK, LOADING)
+
+
+async def wait_loaded(
+    *clients,
+    start_timeout: float = None,
+    timeout: float = LOADING_TIMEOUT,
+    interval: float = POLL_INTERVAL,
+) -> dict:
+    """
+    Waits for every client to go through a loading screen, in a single polling loop.
+    Each client is captured once per ``interval``. It resolves on the first frame where the spellbook is visible again,
+    or once the world has been moving for ``SETTLE_TIME`` seconds (a dialog or a battle on arrival).
+
+    Args:
+        clients: the clients to wait for
+        start_timeout (float, optional): time in seconds after which a client that never showed a loading screen
+            is considered already loaded. Defaults to None (wait for the loading screen until ``timeout``)
+        timeout (float, optional): time in seconds after which the clients still loading are given up on. Defaults to ``LOADING_TIMEOUT``
+        interval (float, optional): time in seconds between two captures. Defaults to ``POLL_INTERVAL``
+
+    Returns:
+        dict of client -> time in seconds spent loading, None for clients that never showed a loading screen.
+        Clients given up on after ``timeout`` are left out.
+    """
+    start = time.monotonic()
+    previous = {}
+    loading_since = {}
+    moving_since = {}
+    results = {}
+    pending = list(clients)
+
+    while pending:
+        for client in list(pending):
+            frame = LoadingFrame.capture(client, previous.get(client))
+            previous[client] = frame
+
+            if frame.state == LOADING and frame.difference is None:
+                # First frame: a still picture and a moving world can't be told apart yet
+                continue
+
+            if frame.is_loading:
+                loading_since.setdefault(client, frame.timestamp)
+                moving_since.pop(client, None)
+            elif client in loading_since:
+                if frame.state == SCENE:
+                    since = moving_since.setdefault(client, frame.timestamp)
+                    if frame.timestamp - since < SETTLE_TIME:
+                        continue
+                    loaded_at = since
+                else:
+                    loaded_at = frame.timestamp
+                results[client] = loaded_at - loading_since[client]
+                pending.remove(client)
+            elif start_timeout is not None and frame.timestamp - start > start_timeout:
+                results[client] = None
+                pending.remove(client)
+
+        if pending and timeout is not None and time.monotonic() - start > timeout:
+            break
+
+        if pending:
+            await asyncio.sleep(interval)
+
+    return results
@@ -6,6 +6,7 @@ import asyncio
 
 # Custom imports
 from wizsdk.window import Window, screen_size
+from wizsdk.timing import get_delay
 
 # If the mouse is over a coordinate in FAILSAFE_POINTS and FAILSAFE is True, the FailSafeException is raised.
 # The rest of the points are added to the FAILSAFE_POINTS list at the bottom of this file, after size() has been defined.
@@ -29,6 +30,40 @@ class FailSafeException(Exception):
         super().__init__(self.message)
 
 
+class CursorLock:
+    """
+    Lock shared by the ``Mouse`` of clients moving the real cursor at the same time (without silent mouse),
+    so the move and the click of one client are never split by another client's. Reentrant within a task.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._owner = None
+        self._depth = 0
+
+    async def __aenter__(self):
+        task = asyncio.current_task()
+        if self._owner is not task:
+            await self._lock.acquire()
+            self._owner = task
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            self._owner = None
+            self._lock.release()
+
+
+class _NoLock:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
 def getPointOnLine(x1, y1, x2, y2, n):
     """
     Returns an (x, y) tuple of the point that has progressed a proportion ``n`` along the line defined by the two
@@ -72,6 +107,8 @@ class Mouse(Window):
             raise ValueError("A walker must be passed to Mouse to use silent mode")
 
         self.silent_mode = silent_mode
+        # Set by ``TeamBattle`` when several clients share the real cursor
+        self.cursor_lock = None
         self.silent_xpos = 0
         self.silent_ypos = 0
         self.silent_init = False
@@ -79,14 +116,10 @@ class Mouse(Window):
     def _do_event(self, flags, x_pos, y_pos, data, extra_info):
         """generate a mouse event"""
         if not self.silent_mode:
-            x_calc = int(
-                65536 * x_pos / ctypes.windll.user32.GetSystemMetrics(self._SM_CXSCREEN)
-                + 1
-            )
-            y_calc = int(
-                65536 * y_pos / ctypes.windll.user32.GetSystemMetrics(self._SM_CYSCREEN)
-                + 1
-            )
+            # Cached, instead of 2 GetSystemMetrics calls per event
+            screen_w, screen_h = screen_size()
+            x_calc = int(65536 * x_pos / screen_w + 1)
+            y_calc = int(65536 * y_pos / screen_h + 1)
             return ctypes.windll.user32.mouse_event(
                 flags, x_calc, y_calc, data, extra_info
             )
@@ -95,6 +128,18 @@ class Mouse(Window):
                 "Mouse._do_event is not supported with silent mode enabled"
             )
 
+    def hold(self):
+        """
+        Async context manager keeping the cursor for the current task while ``cursor_lock`` is set. Does nothing otherwise.
+
+        .. code-block:: py
+
+            async with player.mouse.hold():
+                await player.mouse.move_to(100, 100)
+                await player.mouse.click()
+        """
+        return self.cursor_lock or _NoLock()
+
     def _get_button_value(self, button_name, button_up=False):
         """convert the name of the button into the corresponding value"""
         buttons = 0
@@ -218,31 +263,32 @@ class Mouse(Window):
             if x == -1 and y == -1:
                 duration = 0
             else:
-                duration = 0.5
-
-        # If position is not set, use current mouse position
-        old_pos = self.get_position()
-        x = x if (x != -1) else old_pos[0]
-        y = y if (y != -1) else old_pos[1]
-        await self.move_to(x, y, duration=duration)
-        await asyncio.sleep(delay)
-        if not self.silent_mode:
-            self.set_active()
-            self._do_event(
-                self._get_button_value(button, False)
-                + self._get_button_value(button, True),
-                0,
-                0,
-                0,
-                0,
-            )
-        else:
-            (nx, ny) = self.wizsdk_client_coords_to_wizwalker(
-                x, y
-            )  # this is needed because walker.click implicitly converts client to screen, but with a different method
-            await self.walker.mouse_handler.click(
-                nx, ny, right_click=button != "left", sleep_duration=delay
-            )
+                duration = get_delay("mouse.click.duration")
+
+        async with self.hold():
+            # If position is not set, use current mouse position
+            old_pos = self.get_position()
+            x = x if (x != -1) else old_pos[0]
+            y = y if (y != -1) else old_pos[1]
+            await self.move_to(x, y, duration=duration)
+            await asyncio.sleep(delay)
+            if not self.silent_mode:
+                self.set_active()
+                self._do_event(
+                    self._get_button_value(button, False)
+                    + self._get_button_value(button, True),
+                    0,
+                    0,
+                    0,
+                    0,
+                )
+            else:
+                (nx, ny) = self.wizsdk_client_coords_to_wizwalker(
+                    x, y
+                )  # this is needed because walker.click implicitly converts client to screen, but with a different method
+                await self.walker.mouse_handler.click(
+                    nx, ny, right_click=button != "left", sleep_duration=delay
+                )
 
     def double_click(self, pos=(-1, -1), button="left"):
         """Double click at the specifed placed"""
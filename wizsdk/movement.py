@@ -0,0 +1,136 @@
+# Native imports
+import math
+import time
+import asyncio
+from collections import namedtuple
+
+# Third-party imports
+from wizwalker import XYZ
+
+ARRIVAL_TOLERANCE = 30.0
+""" Distance (in game units) from the destination at which the player is considered arrived """
+
+CORRECTION_INTERVAL = 0.05
+""" Time in seconds between two position reads while walking """
+
+YAW_TOLERANCE = 0.05
+""" Heading error (in radians) corrected with ``set_yaw`` """
+
+STALL_TIMEOUT = 2.0
+""" Time in seconds without getting closer after which the walk is abandoned """
+
+MoveResult = namedtuple("MoveResult", "arrived distance elapsed corrections")
+"""
+Result of ``MovementController.move_to``
+
+Attributes:
+    arrived (bool): True if the player stopped within the tolerance
+    distance (float): distance left to the destination
+    elapsed (float): time in seconds spent walking (time to arrive)
+    corrections (int): number of heading corrections
+
+:meta private:
+"""
+
+
+def _angle_difference(a: float, b: float) -> float:
+    """ Smallest signed difference between two angles in radians """
+    return (a - b + math.pi) % (2 * math.pi) - math.pi
+
+
+class MovementController:
+    """
+    Walks to a location by holding W and correcting the player's heading as it goes.
+    Position and yaw are read together at a high rate, and the yaw is only written when the heading drifts.
+
+    Example:
+        .. code-block:: py
+
+            controller = MovementController(player, tolerance=20)
+            result = await controller.move_to(XYZYaw(x=-300, y=2800, z=0, yaw=0))
+            print(f"Arrived in {result.elapsed:.2f}s")
+    """
+
+    def __init__(
+        self,
+        client,
+        tolerance: float = ARRIVAL_TOLERANCE,
+        interval: float = CORRECTION_INTERVAL,
+        yaw_tolerance: float = YAW_TOLERANCE,
+        stall_timeout: float = STALL_TIMEOUT,
+    ):
+        """
+        Args:
+            client: the ``Client`` to move
+            tolerance (float, optional): see ``ARRIVAL_TOLERANCE``
+            interval (float, optional): see ``CORRECTION_INTERVAL``
+            yaw_tolerance (float, optional): see ``YAW_TOLERANCE``
+            stall_timeout (float, optional): see ``STALL_TIMEOUT``
+        """
+        self.client = client
+        self.tolerance = tolerance
+        self.interval = interval
+        self.yaw_tolerance = yaw_tolerance
+        self.stall_timeout = stall_timeout
+
+    async def read_pose(self):
+        """
+        Reads the player's position and yaw at once
+
+        Returns:
+            (XYZ, float) position and yaw
+        """
+        body = self.client.walker.body
+        return await asyncio.gather(body.position(), body.yaw())
+
+    async def move_to(self, location, timeout: float = None) -> MoveResult:
+        """
+        Walks to ``location``. Only the x and y values are used.
+
+        Args:
+            location: ``XYZYaw`` or ``XYZ`` to walk to
+            timeout (float, optional): time in seconds after which the walk is abandoned. Defaults to None
+
+        Returns:
+            MoveResult
+        """
+        walker = self.client.walker
+        target = XYZ(location.x, location.y, location.z)
+        start = time.monotonic()
+        corrections = 0
+
+        position, yaw = await self.read_pose()
+        distance = math.hypot(target.x - position.x, target.y - position.y)
+        if distance <= self.tolerance or await walker.move_lock():
+            return MoveResult(distance <= self.tolerance, distance, 0.0, 0)
+
+        best_distance = distance
+        last_progress = start
+
+        self.client.key_down("W")
+        try:
+            while True:
+                target_yaw = position.yaw(target)
+                if abs(_angle_difference(target_yaw, yaw)) > self.yaw_tolerance:
+                    await walker.set_yaw(target_yaw)
+                    corrections += 1
+
+                await asyncio.sleep(self.interval)
+
+                position, yaw = await self.read_pose()
+                distance = math.hypot(target.x - position.x, target.y - position.y)
+                now = time.monotonic()
+
+                if distance <= self.tolerance:
+                    return MoveResult(True, distance, now - start, corrections)
+
+                if distance < best_distance - 1:
+                    best_distance = distance
+                    last_progress = now
+                elif now - last_progress > self.stall_timeout:
+                    return MoveResult(False, distance, now - start, corrections)
+
+                if timeout is not None and now - start > timeout:
+                    return MoveResult(False, distance, now - start, corrections)
+        finally:
+            self.client.key_up("W")
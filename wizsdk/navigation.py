@@ -0,0 +1,293 @@
+# Native imports
+import heapq
+import asyncio
+
+# Third-party imports
+import numpy as np
+
+DEFAULT_NODE_SPACING = 150.0
+""" Samples closer than this (in game units) to an existing waypoint reuse it """
+
+
+class KDTree:
+    """
+    Static k-d tree over a (N, 3) array of points, stored in flat arrays.
+    Used to find the waypoint nearest to a position.
+    """
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=np.float64)
+        count = len(self.points)
+        # Node i of the tree holds the point order[i] and splits on axis[i].
+        # Children of the subtree [start, end) are [start, mid) and [mid + 1, end)
+        self.order = np.arange(count)
+        self.axis = np.zeros(count, dtype=np.int8)
+        self._build()
+
+    def _build(self):
+        stack = [(0, len(self.order), 0)]
+        while stack:
+            start, end, depth = stack.pop()
+            if end - start <= 0:
+                continue
+            axis = depth % 3
+            indices = self.order[start:end]
+            mid = (end - start) // 2
+            indices[:] = indices[np.argsort(self.points[indices, axis], kind="stable")]
+            self.axis[start + mid] = axis
+            stack.append((start, start + mid, depth + 1))
+            stack.append((start + mid + 1, end, depth + 1))
+
+    def nearest(self, point) -> tuple:
+        """
+        Returns:
+            (index, distance) of the point closest to ``point``, (None, inf) if the tree is empty
+        """
+        point = np.asarray(point, dtype=np.float64)
+        best, best_d2 = None, np.inf
+        stack = [(0, len(self.order))]
+
+        while stack:
+            start, end = stack.pop()
+            if end - start <= 0:
+                continue
+            node = start + (end - start) // 2
+            index = self.order[node]
+            d2 = float(((self.points[index] - point) ** 2).sum())
+            if d2 < best_d2:
+                best, best_d2 = int(index), d2
+
+            axis = self.axis[node]
+            diff = point[axis] - self.points[index, axis]
+            near, far = ((start, node), (node + 1, end))
+            if diff > 0:
+                near, far = far, near
+            # Visit the near side first, the far side only if it can hold a closer point
+            if diff ** 2 < best_d2:
+                stack.append(far)
+            stack.append(near)
+
+        return best, best_d2 ** 0.5
+
+
+class WaypointGraph:
+    """
+    Graph of the walkable waypoints of a zone, recorded from the player's positions.
+    Nodes are stored in a (N, 3) float array and edges in a (E, 2) int array. Routes are computed with A*.
+
+    Example:
+        .. code-block:: py
+
+            # Walk around the zone once to record it
+            graph = WaypointGraph(zone=await player.walker.zone_name())
+            await graph.record(player, duration=120)
+            graph.save("wizard_city.npz")
+
+            # Later
+            graph = WaypointGraph.load("wizard_city.npz")
+            await player.travel_to(XYZYaw(x=-300, y=2800, z=0, yaw=0), graph)
+    """
+
+    def __init__(
+        self,
+        positions=None,
+        edges=None,
+        zone: str = None,
+        node_spacing: float = DEFAULT_NODE_SPACING,
+    ):
+        """
+        Args:
+            positions (optional): (N, 3) array of the waypoints' x, y, z
+            edges (optional): (E, 2) array of the indices of connected waypoints
+            zone (str, optional): name of the zone the graph belongs to
+            node_spacing (float, optional): see ``DEFAULT_NODE_SPACING``
+        """
+        self.positions = np.zeros((0, 3), dtype=np.float32)
+        self.edges = np.zeros((0, 2), dtype=np.int32)
+        if positions is not None:
+            self.positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        if edges is not None:
+            self.edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+
+        self.zone = zone
+        self.node_spacing = node_spacing
+        self._tree = None
+        self._neighbors = None
+        self._last = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def add_node(self, xyz) -> int:
+        """
+        Adds a waypoint
+
+        Returns:
+            int: index of the new waypoint
+        """
+        self.positions = np.vstack(
+            [self.positions, np.asarray(xyz, dtype=np.float32)[:3]]
+        )
+        self._tree = None
+        self._neighbors = None
+        return len(self.positions) - 1
+
+    def connect(self, a: int, b: int):
+        """
+        Marks the straight line between waypoints ``a`` and ``b`` as walkable
+        """
+        if a == b:
+            return
+        edge = np.array([[min(a, b), max(a, b)]], dtype=np.int32)
+        if len(self.edges) and (self.edges == edge).all(axis=1).any():
+            return
+        self.edges = np.vstack([self.edges, edge])
+        self._neighbors = None
+
+    def add_sample(self, xyz) -> int:
+        """
+        Adds a position the player walked through. It is merged with the nearest waypoint if closer
+        than ``node_spacing``, and connected to the waypoint of the previous sample.
+
+        Returns:
+            int: index of the waypoint of the sample
+        """
+        index, distance = self.nearest(xyz)
+        if index is None or distance > self.node_spacing:
+            index = self.add_node(xyz)
+
+        if self._last is not None:
+            self.connect(self._last, index)
+        self._last = index
+        return index
+
+    def break_path(self):
+        """
+        Stops connecting the next sample to the previous one, after a teleport for example
+        """
+        self._last = None
+
+    async def record(self, client, duration: float = None, interval: float = 0.5):
+        """
+        Samples the player's location every ``interval`` seconds for ``duration`` seconds (until cancelled if None)
+        """
+        loop = asyncio.get_running_loop()
+        end = None if duration is None else loop.time() + duration
+        while end is None or loop.time() < end:
+            location = await client.get_player_location()
+            self.add_sample((location.x, location.y, location.z))
+            await asyncio.sleep(interval)
+
+    @classmethod
+    def from_trajectory(
+        cls, trajectory, zone: str = None, node_spacing: float = DEFAULT_NODE_SPACING
+    ) -> "WaypointGraph":
+        """
+        Builds a graph from the samples of a ``Trajectory``
+        """
+        graph = cls(zone=zone, node_spacing=node_spacing)
+        for xyz in trajectory.positions:
+            graph.add_sample(xyz)
+        graph.break_path()
+        return graph
+
+    def nearest(self, xyz) -> tuple:
+        """
+        Returns:
+            (index, distance) of the waypoint closest to ``xyz``, (None, inf) if the graph is empty
+        """
+        if self._tree is None:
+            self._tree = KDTree(self.positions)
+        return self._tree.nearest(np.asarray(xyz, dtype=np.float64)[:3])
+
+    def _adjacency(self):
+        if self._neighbors is None:
+            neighbors = [[] for _ in range(len(self.positions))]
+            lengths = np.linalg.norm(
+                self.positions[self.edges[:, 0]] - self.positions[self.edges[:, 1]],
+                axis=1,
+            )
+            for (a, b), length in zip(self.edges.tolist(), lengths.tolist()):
+                neighbors[a].append((b, length))
+                neighbors[b].append((a, length))
+            self._neighbors = neighbors
+        return self._neighbors
+
+    def shortest_path(self, start: int, goal: int) -> list:
+        """
+        A* search between two waypoints
+
+        Returns:
+            list of waypoint indices from ``start`` to ``goal``, None if they aren't connected
+        """
+        neighbors = self._adjacency()
+        positions = self.positions.astype(np.float64)
+        heuristic = np.linalg.norm(positions - positions[goal], axis=1)
+
+        came_from = {start: None}
+        cost = {start: 0.0}
+        heap = [(heuristic[start], start)]
+
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = came_from[node]
+                return path[::-1]
+
+            for neighbor, length in neighbors[node]:
+                new_cost = cost[node] + length
+                if new_cost < cost.get(neighbor, np.inf):
+                    cost[neighbor] = new_cost
+                    came_from[neighbor] = node
+                    heapq.heappush(heap, (new_cost + heuristic[neighbor], neighbor))
+
+        return None
+
+    def route(self, start_xyz, goal_xyz):
+        """
+        Computes the waypoints to go through from ``start_xyz`` to ``goal_xyz``,
+        entering and leaving the graph at the waypoints nearest to them.
+
+        Returns:
+            (K, 3) array of positions, ending with ``goal_xyz``. None if no route exists
+        """
+        if not len(self.positions):
+            return None
+
+        start, _ = self.nearest(start_xyz)
+        goal, _ = self.nearest(goal_xyz)
+        path = self.shortest_path(start, goal)
+        if path is None:
+            return None
+
+        return np.vstack(
+            [self.positions[path], np.asarray(goal_xyz, dtype=np.float32)[:3]]
+        )
+
+    def save(self, path: str):
+        """
+        Writes the graph to a ``.npz`` file
+        """
+        np.savez_compressed(
+            path,
+            positions=self.positions,
+            edges=self.edges,
+            zone=np.array(self.zone or ""),
+            node_spacing=np.array(self.node_spacing),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "WaypointGraph":
+        """
+        Reads a graph written by ``save``
+        """
+        with np.load(path) as data:
+            return cls(
+                data["positions"],
+                data["edges"],
+                zone=str(data["zone"]) or None,
+                node_spacing=float(data["node_spacing"]),
+            )
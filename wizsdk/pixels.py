@@ -1,6 +1,9 @@
 # Native imports
 import ctypes
 import ctypes.wintypes
+import functools
+import asyncio
+import time
 from os import path
 
 # Third-party imports
@@ -58,22 +61,31 @@ class DeviceContext(Window):
         super().__init__(handle)
         self.window_handle = handle
 
-    def get_image(self, region=None):
+    def get_image(self, region=None, scale=1):
         """
         returns a byte array with the pixel data of the ``region`` from the ``window_handle`` window. ``region`` is relative to the ``window_handle`` window. If no ``region`` is specified, it will capture the entire window. If no ``window_handle`` is provided on initiation, monitor 1 is used as the context.
 
+        With a ``scale`` below 1, the region is downsampled by ``StretchBlt`` while it is captured, so fewer bytes are moved.
+        Match downsampled captures with templates from ``scaled_template``.
+
         Args:
             region: (x, y, width, height) tuple relative to the ``window_handle`` context. Defaults to None
+            scale: size of the capture relative to the region, 0.5 or 0.25 for example. Defaults to 1
 
         Returns:
             A 2d numpy array representing the pixel data of the captured region.
         """
 
-        _, _, w, h = self.get_rect()
-        x, y = 0, 0
-
         if region and len(region) == 4:
             x, y, w, h = region
+        else:
+            _, _, w, h = self.get_rect()
+            x, y = 0, 0
+
+        # Size of the bitmap
+        dest_w, dest_h = w, h
+        if scale != 1:
+            dest_w, dest_h = max(1, round(w * scale)), max(1, round(h * scale))
 
         # Get devices context
         wDC = user32.GetWindowDC(self.window_handle)
@@ -89,7 +101,7 @@ class DeviceContext(Window):
 
         gdi32.SetStretchBltMode(wDC, 4)
         # Create empty bitmap
-        mBM = gdi32.CreateCompatibleBitmap(wDC, w, h)
+        mBM = gdi32.CreateCompatibleBitmap(wDC, dest_w, dest_h)
         if mBM == 0:
             print("Bitmap creation error")
             return []
@@ -97,7 +109,13 @@ class DeviceContext(Window):
         # Select wDC into bitmap
         gdi32.SelectObject(mDC, mBM)
 
-        gdi32.BitBlt(mDC, 0, 0, w, h, wDC, x, y, 0x00CC0020)
+        if (dest_w, dest_h) == (w, h):
+            gdi32.BitBlt(mDC, 0, 0, w, h, wDC, x, y, 0x00CC0020)
+        else:
+            # The stretch mode applies to the destination: HALFTONE averages the source pixels
+            gdi32.SetStretchBltMode(mDC, 4)
+            gdi32.SetBrushOrgEx(mDC, 0, 0, None)
+            gdi32.StretchBlt(mDC, 0, 0, dest_w, dest_h, wDC, x, y, w, h, 0x00CC0020)
 
         bitmap = _BITMAP()
 
@@ -152,6 +170,16 @@ class DeviceContext(Window):
         img = img[:, :, :3]
         return img
 
+    @property
+    def coords(self):
+        """
+        ``CoordinateSpace`` mapping the canonical 800x600 layout to this window's client size
+        """
+        # Imported here, the coords module depends on this one
+        from .coords import coordinate_space
+
+        return coordinate_space(self)
+
     def get_pixel(self, x, y) -> tuple:
         """
         Returns the (red, green, blue) channel's of the pixel at ``x``, ``y`` relative to the ``window_handle`` context.
@@ -184,6 +212,33 @@ class DeviceContext(Window):
         cv2.waitKey(0)
         cv2.imwrite(filename, image)
 
+    async def wait_for_change(
+        self, region=None, timeout=1.0, *, reference=None, threshold=6, interval=0.03
+    ) -> bool:
+        """
+        Waits for the pixels of ``region`` to change. The region is captured every ``interval`` seconds and compared to ``reference`` with ``frame_difference``.
+
+        Args:
+            region: (x, y, width, height) tuple relative to the ``window_handle`` context. Defaults to None (the entire window)
+            timeout: time in seconds before giving up. Defaults to 1
+            reference: capture of the region to compare to. Defaults to a capture made when the function is called
+            threshold: average difference per channel for the region to be considered changed. Defaults to 6
+            interval: time in seconds between two captures. Defaults to 0.03
+
+        Returns:
+            True as soon as the region changed, False if it timed out.
+        """
+        if reference is None:
+            reference = self.get_image(region)
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            if frame_difference(reference, self.get_image(region)) > threshold:
+                return True
+
+        return False
+
     def pixel_matches_color(self, xy, expected_rgb, tolerance=0):
         """
         gets the value of a pixel with ``get_pixel`` and checks it against ``expected_rgb``. Accepts ``tolerance`` amount of differences between the pixel and its expected value.
@@ -241,7 +296,14 @@ class DeviceContext(Window):
         return least_gray
 
     def locate_on_screen(
-        self, match_img, region=None, *, threshold=0.1, debug=False, folder=None
+        self,
+        match_img,
+        region=None,
+        *,
+        threshold=0.1,
+        debug=False,
+        folder=None,
+        canonical=False,
     ):
         """
         Attempts to locate `match_img` in the Wizard101 window.
@@ -256,6 +318,7 @@ class DeviceContext(Window):
             theshold: precision of the match -- between 0 and 1, the lowest being more precise
             debug: set to True to show a pop up of the area that matched the image provided.
             folder: folder to look in. Overrides ``IMAGE_FOLDER`` default
+            canonical: ``region`` and the result are in canonical 800x600 coordinates, and the image is scaled to the client. See ``coords``
 
         Returns:
             (x, y) tuple for center of match if found. False otherwise.
@@ -266,25 +329,233 @@ class DeviceContext(Window):
             if type(match_img) == str
             else match_img
         )
+        coords = self.coords if canonical else None
+        if coords is not None:
+            to_match = coords.template(to_match)
+            region = coords.region(region)
+
         match = match_image(
             self.get_image(region=region), to_match, threshold, debug=debug
         )
 
-        if not match or not region:
+        if not match:
             return match
 
-        region_x, region_y = region[:2]
         x, y = match
-        return x + region_x, y + region_y
+        if region:
+            x, y = x + region[0], y + region[1]
+        if coords is not None:
+            x, y = coords.to_canonical(x, y)
+        return x, y
+
+
+class SharedCapture:
+    """
+    Captures several windows with a single blit of the screen area covering all of them,
+    then slices the capture into one view per window. Views share the capture's memory (no copy)
+    and are indexed like ``get_image`` captures of the windows.
+
+    The screen shows whatever is on top: windows covered by another window are captured separately
+    with ``get_image``. Tile the windows with ``tile_windows`` so they all come from the single blit.
+
+    ``TeamBattle`` and ``run_autopilots`` share one between their clients, so polling every client costs one blit per tick.
+
+    Example:
+        .. code-block:: py
+
+            tile_windows(p1, p2, p3, p4)
+            capture = SharedCapture(p1, p2, p3, p4)
+
+            # One blit for the 4 clients
+            images = capture.capture()
+            frames = [BattleFrame.from_image(image, coords=p.coords) for image, p in zip(images, capture.windows)]
+    """
+
+    def __init__(self, *windows):
+        """
+        Args:
+            windows: the windows (``Client`` for example) to capture
+        """
+        self.windows = list(windows)
+        self.image = None
+        self.timestamp = None
+        self.blits = 0
+        self._screen = DeviceContext(None)
+        self._views = {}
+
+    def union_rect(self, rects: list = None) -> tuple:
+        """
+        Args:
+            rects (list, optional): rectangles of the windows. Defaults to their current rectangles
+
+        Returns:
+            (x, y, width, height) of the screen area covering all the windows
+        """
+        if rects is None:
+            rects = self._rects()
+        left = min(r[0] for r in rects)
+        top = min(r[1] for r in rects)
+        right = max(r[0] + r[2] for r in rects)
+        bottom = max(r[1] + r[3] for r in rects)
+        return left, top, right - left, bottom - top
+
+    def overlapping(self) -> bool:
+        """
+        True if some windows overlap, which hides part of them from the capture
+        """
+        rects = self._rects()
+        for i, (x1, y1, w1, h1) in enumerate(rects):
+            for x2, y2, w2, h2 in rects[i + 1 :]:
+                if x1 < x2 + w2 and x2 < x1 + w1 and y1 < y2 + h2 and y2 < y1 + h1:
+                    return True
+        return False
+
+    def capture(self) -> list:
+        """
+        Blits the screen area covering all the windows once. Rectangles are read again,
+        so windows that just moved are sliced at their new position.
+
+        Returns:
+            list of the views of every window, in the order the windows were given
+        """
+        rects = self._rects()
+        union_x, union_y, _, _ = union = self.union_rect(rects)
+        self.image = self._screen.get_image(union)
+        self.timestamp = time.monotonic()
+        self.blits += 1
+
+        views = []
+        for window, (x, y, w, h) in zip(self.windows, rects):
+            if _is_uncovered(window.window_handle, (x, y, w, h)):
+                x, y = x - union_x, y - union_y
+                views.append(self.image[y : y + h, x : x + w])
+            else:
+                # Another window is on top of this one on the screen
+                views.append(window.get_image())
+
+        self._views = dict(zip(self.windows, views))
+        return views
+
+    def view(self, window, region=None, max_age: float = None):
+        """
+        Returns the view of ``window`` from the last ``capture``, or the ``region`` of it.
+        Captures again if nothing has been captured yet, or if the last capture is older than ``max_age`` seconds.
+
+        Args:
+            window: one of the windows
+            region (optional): (x, y, width, height) area of the view, relative to the window. Defaults to the whole window
+            max_age (float, optional): how old the capture can be, in seconds. Defaults to None (any age)
+        """
+        stale = max_age is not None and (
+            self.timestamp is None or time.monotonic() - self.timestamp > max_age
+        )
+        if stale or window not in self._views:
+            self.capture()
+        image = self._views[window]
+        return crop(image, region) if region else image
+
+    def _rects(self):
+        # The cached rectangles can be out of date right after a window moved
+        return [w.get_rect(max_age=0) for w in self.windows]
+
+
+def _is_uncovered(handle, rect) -> bool:
+    """ True if the center and the corners of ``rect`` show the window ``handle`` on the screen """
+    x, y, w, h = rect
+    points = [
+        (x + w // 2, y + h // 2),
+        (x + 1, y + 1),
+        (x + w - 2, y + 1),
+        (x + 1, y + h - 2),
+        (x + w - 2, y + h - 2),
+    ]
+    for px, py in points:
+        on_top = user32.WindowFromPoint(ctypes.wintypes.POINT(px, py))
+        # GA_ROOT: the top level window of the control under the point
+        if user32.GetAncestor(on_top, 2) != handle:
+            return False
+    return True
+
+
+@functools.lru_cache(maxsize=256)
+def load_image(filename: str):
+    """
+    Loads an image file as a numpy array. Images are cached, so templates used in polling loops are only read from disk once.
+
+    Args:
+        filename: the path of the image
+
+    Returns:
+        A numpy array with the (blue, green, red) pixel data of the image.
+    """
+    # cv2.IMREAD_COLOR ignores alpha channel, loads only rgb
+    return cv2.imdecode(np.fromfile(filename, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+@functools.lru_cache(maxsize=256)
+def _scaled_image(filename: str, scale: float):
+    return _resize(load_image(filename), scale)
+
+
+def _resize(img, scale):
+    h, w = img.shape[:2]
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+
+def scaled_template(template, scale: float = 1):
+    """
+    Returns a template resized to match captures made with ``get_image(scale=scale)``. Resized image files are cached.
+
+    Args:
+        template: file name or numpy array of the image
+        scale: the capture's scale. Defaults to 1
+    """
+    if scale == 1:
+        return template
+    if type(template) is str:
+        return _scaled_image(template, scale)
+    return _resize(template, scale)
+
+
+def image_pixel_matches_color(img, xy, expected_rgb, tolerance=0) -> bool:
+    """
+    Same as ``DeviceContext.pixel_matches_color`` but reads the pixel from an image returned by ``get_image`` instead of the window.
+
+    Args:
+        img: the captured image
+        xy: (x, y) position of the pixel in the image
+        expected_rgb: (r, g, b) expected color
+        tolerance: difference allowed on each channel
+
+    Returns:
+        False if ``xy`` is outside of the image
+    """
+    x, y = xy
+    if not (0 <= y < len(img) and 0 <= x < len(img[0])):
+        return False
+    # Captured images are stored as (blue, green, red)
+    b, g, r = (int(c) for c in img[y, x][:3])
+    exR, exG, exB = expected_rgb[:3]
+    return (
+        (abs(r - exR) <= tolerance)
+        and (abs(g - exG) <= tolerance)
+        and (abs(b - exB) <= tolerance)
+    )
+
+
+def crop(img, region):
+    """
+    Returns the ``(x, y, width, height)`` ``region`` of an image returned by ``get_image``. No pixel data is copied.
+    """
+    x, y, w, h = region
+    return img[y : y + h, x : x + w]
 
 
 def _to_cv2_img(data):
     if type(data) is str:
         # It's a file name
-        # cv2.IMREAD_COLOR ignores alpha channel, loads only rgb
-        img = cv2.imdecode(np.fromfile(data, dtype=np.uint8), cv2.IMREAD_COLOR)
-
-        return img
+        return load_image(data)
 
     elif type(data) is np.ndarray:
         # It's a np array
@@ -355,3 +626,55 @@ def match_image(largeImg, smallImg, threshold=0.1, debug=False):
 
     # Return coordinates to center of match
     return (x + (w // 2), y + (h // 2))
+
+
+def match_image_all(largeImg, smallImg, threshold=0.1):
+    """
+    Finds every occurrence of smallImg in largeImg using template matching.
+    Adjust threshold for the precision of the match (between 0 and 1, the lowest being more precise)
+
+    Returns:
+        list of (x, y) tuples of the center of the matches, the best match first. Neighbouring pixels of a match are returned as well.
+    """
+    small_image = _to_cv2_img(smallImg)
+    large_image = _to_cv2_img(largeImg)
+
+    if (small_image is None) or (large_image is None):
+        print("Error: large_image or small_image is None")
+        return []
+
+    h, w = small_image.shape[:-1]
+
+    try:
+        result = cv2.matchTemplate(large_image, small_image, cv2.TM_SQDIFF_NORMED)
+    except cv2.error as e:
+        print(e)
+        return []
+
+    ys, xs = np.nonzero(result < threshold)
+    order = np.argsort(result[ys, xs], kind="stable")
+    return [(int(xs[i]) + (w // 2), int(ys[i]) + (h // 2)) for i in order]
+
+
+def gray_level(img) -> int:
+    """
+    Returns the greatest difference between the highest and the lowest channel of the pixels of ``img``. The lower it is, the grayer the image.
+    """
+    if img.size == 0:
+        return 0
+    channels = img[:, :, :3].astype(np.int16)
+    return int((channels.max(axis=2) - channels.min(axis=2)).max())
+
+
+def frame_difference(img1, img2, step=2) -> float:
+    """
+    Average difference per channel between two captures of the same region. Only one pixel out of ``step`` is compared in each direction.
+
+    Returns:
+        value between 0 (identical) and 255
+    """
+    if img1.shape != img2.shape:
+        return 255.0
+    a = img1[::step, ::step].astype(np.int16)
+    b = img2[::step, ::step].astype(np.int16)
+    return float(np.abs(a - b).mean())
@@ -0,0 +1,277 @@
+"""
+Offline tool that finds a few pixel probes able to tell UI states apart, from labeled screenshots.
+
+The screenshots folder has one sub folder per state, named after the state::
+
+    screenshots/
+        idle/       001.png 002.png ...
+        press_x/    001.png ...
+        dialog/     001.png ...
+
+Screenshots are full window captures, saved with ``save_labeled_screenshot``. Run the tool with::
+
+    python -m wizsdk.probes screenshots -o probes.json
+
+then load the detectors in your bot with ``load_detectors("probes.json")``.
+"""
+
+# Native imports
+import argparse
+import json
+import os
+import time
+
+# Third-party imports
+import cv2
+import numpy as np
+
+# Custom imports
+from .ui_state import PixelProbe, AllOf
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def save_labeled_screenshot(device_context, folder: str, label: str) -> str:
+    """
+    Captures the whole window and saves it in the ``label`` sub folder of ``folder``
+
+    Returns:
+        The file name of the screenshot
+    """
+    label_folder = os.path.join(folder, label)
+    os.makedirs(label_folder, exist_ok=True)
+    file_name = os.path.join(label_folder, f"{time.time_ns()}.png")
+    cv2.imwrite(file_name, device_context.get_image())
+    return file_name
+
+
+def load_labeled_screenshots(folder: str) -> dict:
+    """
+    Loads the screenshots of every sub folder of ``folder``.
+    They are decoded directly, not through the ``load_image`` cache meant for templates.
+
+    Returns:
+        dict of state name -> list of images
+    """
+    screenshots = {}
+    for label in sorted(os.listdir(folder)):
+        label_folder = os.path.join(folder, label)
+        if not os.path.isdir(label_folder):
+            continue
+        images = [
+            cv2.imdecode(
+                np.fromfile(os.path.join(label_folder, f), dtype=np.uint8),
+                cv2.IMREAD_COLOR,
+            )
+            for f in sorted(os.listdir(label_folder))
+            if f.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        if images:
+            screenshots[label] = images
+    return screenshots
+
+
+def synthesize_probes(
+    positives: list,
+    negatives: list,
+    *,
+    max_probes: int = 4,
+    max_tolerance: int = 30,
+    slack: int = 5,
+    step: int = 2,
+) -> tuple:
+    """
+    Greedily picks pixel probes that all ``positives`` match and that rule out the most ``negatives``,
+    until every negative is ruled out by at least one probe.
+
+    A pixel is a candidate if its color varies by less than ``max_tolerance`` across the positives.
+    Its probe color is the middle of that range, and its tolerance covers the range plus ``slack``.
+
+    Args:
+        positives: images of the state
+        negatives: images of every other state
+        max_probes (int): maximum number of probes. Defaults to 4
+        max_tolerance (int): highest tolerance of a probe. Defaults to 30
+        slack (int): tolerance added on top of the color range of the positives. Defaults to 5
+        step (int): only one pixel out of ``step`` is considered in each direction. Defaults to 2
+
+    Returns:
+        (probes, negatives_left) -- list of ``PixelProbe``, and the number of negatives they don't rule out
+    """
+    height = min(img.shape[0] for img in positives + negatives)
+    width = min(img.shape[1] for img in positives + negatives)
+
+    def stack(images):
+        return np.stack([img[:height:step, :width:step, :3] for img in images]).astype(
+            np.int16
+        )
+
+    pos = stack(positives)
+    low, high = pos.min(axis=0), pos.max(axis=0)
+    center = (low + high) // 2
+    tolerance = ((high - low + 1) // 2).max(axis=2) + slack
+    candidates = tolerance <= max_tolerance
+
+    if negatives:
+        neg = stack(negatives)
+        # (negative, y, x): the probe at (y, x) rules the negative out
+        rejects = (np.abs(neg - center).max(axis=3) > tolerance) & candidates
+    else:
+        rejects = np.zeros((0,) + candidates.shape, dtype=bool)
+
+    probes = []
+    remaining = np.ones(len(rejects), dtype=bool)
+
+    while len(probes) < max_probes and candidates.any():
+        score = rejects[remaining].sum(axis=0).astype(np.float64)
+        # Prefer the most stable pixel between probes with the same score
+        score -= tolerance / (max_tolerance + slack + 1)
+        score[~candidates] = -np.inf
+
+        y, x = np.unravel_index(np.argmax(score), score.shape)
+        if probes and not rejects[remaining, y, x].any():
+            # No probe rules out the negatives left
+            break
+
+        b, g, r = (int(c) for c in center[y, x])
+        probes.append(
+            PixelProbe((int(x) * step, int(y) * step), (r, g, b), int(tolerance[y, x]))
+        )
+        remaining &= ~rejects[:, y, x]
+        candidates[y, x] = False
+
+        if not remaining.any():
+            break
+
+    return probes, int(remaining.sum())
+
+
+def synthesize_detectors(screenshots: dict, **kwargs) -> dict:
+    """
+    Runs ``synthesize_probes`` for every state of ``screenshots`` against the screenshots of the other states.
+    States without any stable pixel get no probes, and are left out: an empty detector would match every frame.
+
+    Args:
+        screenshots: dict of state name -> list of images, see ``load_labeled_screenshots``
+        kwargs: options of ``synthesize_probes``
+
+    Returns:
+        dict of state name -> list of ``PixelProbe``
+    """
+    detectors = {}
+    for state, positives in screenshots.items():
+        negatives = [
+            img
+            for other, images in screenshots.items()
+            if other != state
+            for img in images
+        ]
+        probes, left = synthesize_probes(positives, negatives, **kwargs)
+        if not probes:
+            print(f"{state}: no pixel is stable across its screenshots, skipped")
+            continue
+        if left:
+            print(f"{state}: {left} screenshots of other states are not ruled out")
+        detectors[state] = probes
+    return detectors
+
+
+def save_detectors(detectors: dict, path: str):
+    """
+    Writes the probes returned by ``synthesize_detectors`` to a json file
+    """
+    data = {
+        state: [
+            {"xy": list(p.xy), "rgb": list(p.rgb), "tolerance": p.tolerance}
+            for p in probes
+        ]
+        for state, probes in detectors.items()
+        if probes
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_detectors(path: str) -> dict:
+    """
+    Reads a file written by ``save_detectors``. States without probes are skipped.
+
+    Returns:
+        dict of state name -> detector, ready for ``register_detector``
+
+    Examples:
+        .. code-block:: py
+
+            for name, detector in load_detectors("probes.json").items():
+                wizsdk.register_detector(name, detector)
+
+            print(player.ui_state())
+    """
+    with open(path) as f:
+        data = json.load(f)
+
+    return {
+        state: AllOf(
+            *[
+                PixelProbe(tuple(p["xy"]), tuple(p["rgb"]), p["tolerance"])
+                for p in probes
+            ]
+        )
+        for state, probes in data.items()
+        if probes
+    }
+
+
+def evaluate_detectors(detectors: dict, screenshots: dict) -> dict:
+    """
+    Returns the accuracy (between 0 and 1) of every detector on labeled screenshots
+    """
+    accuracy = {}
+    for state, detector in detectors.items():
+        if isinstance(detector, list):
+            detector = AllOf(*detector)
+        results = [
+            detector.matches(img) == (label == state)
+            for label, images in screenshots.items()
+            for img in images
+        ]
+        accuracy[state] = sum(results) / len(results)
+    return accuracy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Finds pixel probes that tell UI states apart from labeled screenshots"
+    )
+    parser.add_argument(
+        "folder", help="folder with one sub folder of screenshots per state"
+    )
+    parser.add_argument(
+        "-o", "--output", default="probes.json", help="json file to write"
+    )
+    parser.add_argument("--max-probes", type=int, default=4)
+    parser.add_argument("--max-tolerance", type=int, default=30)
+    parser.add_argument("--step", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    screenshots = load_labeled_screenshots(args.folder)
+    if len(screenshots) < 2:
+        print("At least 2 states are required")
+        return 1
+
+    detectors = synthesize_detectors(
+        screenshots,
+        max_probes=args.max_probes,
+        max_tolerance=args.max_tolerance,
+        step=args.step,
+    )
+    for state, accuracy in evaluate_detectors(detectors, screenshots).items():
+        print(f"{state}: {len(detectors[state])} probes, {accuracy:.1%} accuracy")
+
+    save_detectors(detectors, args.output)
+    print(f"Probes written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
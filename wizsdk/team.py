@@ -0,0 +1,371 @@
+# Native imports
+import sys
+import math
+import time
+import asyncio
+from contextlib import ExitStack
+
+# Custom imports
+from .mouse import CursorLock
+from .pixels import SharedCapture
+
+FOLLOW_DISTANCE = 200.0
+""" Followers further than this (in game units) from the leader are moved """
+
+TELEPORT_DISTANCE = 1000.0
+""" Followers further than this (in game units) from the leader are teleported instead of walking """
+
+FOLLOW_INTERVAL = 0.25
+""" Time in seconds between two reads of the leader's position """
+
+
+class RoundBarrier:
+    """
+    Barrier shared by the strategies of a ``TeamBattle`` round.
+    Every strategy waiting on it is released once all the strategies still playing have reached it.
+    Strategies that return are removed from the barrier, so they never block the others.
+    """
+
+    def __init__(self, parties: int):
+        self._parties = parties
+        self._count = 0
+        self._event = asyncio.Event()
+
+    @property
+    def parties(self) -> int:
+        """ Number of strategies still taking part in the barrier """
+        return self._parties
+
+    async def wait(self):
+        """
+        Waits for the other strategies to reach the barrier
+        """
+        event = self._event
+        self._count += 1
+        if self._count >= self._parties:
+            self._release()
+        else:
+            await event.wait()
+
+    def leave(self):
+        """
+        Removes a strategy from the barrier
+        """
+        self._parties -= 1
+        if self._count and self._count >= self._parties:
+            self._release()
+
+    def abort(self):
+        """
+        Releases every strategy waiting on the barrier, and the ones that reach it later
+        """
+        self._parties = 0
+        self._release()
+
+    def _release(self):
+        self._event.set()
+        # Next phase
+        self._event = asyncio.Event()
+        self._count = 0
+
+
+class TeamBattle:
+    """
+    Plays a battle with several clients at once. Every client detects the round from its own
+    ``BattleFrame``, then the strategies of all the clients run concurrently. Strategies can wait on
+    ``sync`` so that hits are cast after the blades and traps of the rest of the team.
+
+    Clients without silent mouse share the real cursor: their clicks are taken in turns (see ``CursorLock``).
+    The turns of all the clients are read from a single ``SharedCapture`` blit per tick (see ``tile_windows``).
+
+    Example:
+        .. code-block:: py
+
+            p1, p2, p3, p4 = register_clients(4, ["P1", "P2", "P3", "P4"])
+            team = TeamBattle(p1, p2, p3, p4, name="Boss")
+
+            async def support(battle):
+                await battle.client.autocast("storm-blade", target=7)
+                # Let the hitter know the blade is on
+                await team.sync()
+
+            async def hitter(battle):
+                # Wait for the blades
+                await team.sync()
+                await battle.client.autocast("epic", "tempest")
+
+            while await team.loop():
+                await team.play(support, support, support, hitter)
+    """
+
+    def __init__(
+        self, *clients, name: str = None, shared_capture: bool = True, **battle_kwargs
+    ):
+        """
+        Args:
+            clients: the ``Client`` of every member of the team
+            name (str, optional): Name of battle for logging purposes.
+            shared_capture (bool, optional): capture all the clients with one blit. Defaults to True
+            battle_kwargs: additional ``Battle`` options (``poll_fast``, ``poll_slow``)
+        """
+        self.name = name
+        self.logging = True
+        self.capture = None
+        if shared_capture and len(clients) > 1:
+            self.capture = SharedCapture(*clients)
+            if self.capture.overlapping():
+                self.log("Client windows overlap, tile them with tile_windows")
+
+        self.battles = [
+            client.get_battle(name, shared_capture=self.capture, **battle_kwargs)
+            for client in clients
+        ]
+
+        # Clients moving the real cursor click one at a time
+        self.cursor_lock = CursorLock()
+        for client in clients:
+            if not client.silent_mouse:
+                client.mouse.cursor_lock = self.cursor_lock
+
+        self._barrier = None
+        self._round_start = None
+        self._round_times = []
+
+    @property
+    def active_battles(self) -> list:
+        """
+        Battles of the team members that are still fighting
+        """
+        return [b for b in self.battles if not b.is_over]
+
+    @property
+    def round_count(self) -> int:
+        """
+        Current round of the fight. Starts at 1
+        """
+        return max(b.round_count for b in self.battles)
+
+    @property
+    def round_times(self) -> list:
+        """
+        Wall time (in seconds) of every round played, from the first client detecting its turn to the last strategy returning
+        """
+        return list(self._round_times)
+
+    def log(self, message):
+        if self.logging:
+            s = ""
+            if self.name != None:
+                s += f"[{self.name}] "
+            s += message
+            print(s)
+            sys.stdout.flush()
+
+    async def loop(self) -> bool:
+        """
+        Waits for the next round of every client still in the battle.
+
+        Returns:
+            True while at least one client is still fighting
+        """
+        battles = self.active_battles
+        if not battles:
+            return False
+
+        await asyncio.gather(*[b.loop() for b in battles])
+
+        frames = [b.frame for b in self.active_battles if b.frame is not None]
+        if not frames:
+            self.log("Battle has finished")
+            return False
+
+        self._round_start = min(f.timestamp for f in frames)
+        return True
+
+    async def play(self, *strategies):
+        """
+        Runs the strategies of the current round concurrently. Provide one strategy for the whole team,
+        or one per client (in the order the clients were passed in).
+        A strategy is a coroutine function that receives the client's ``Battle``.
+        If a strategy raises, the others are cancelled and the error is raised again.
+
+        Args:
+            strategies: coroutine functions taking a ``Battle``
+        """
+        if len(strategies) == 1:
+            strategies = strategies * len(self.battles)
+        elif len(strategies) != len(self.battles):
+            raise ValueError(
+                f"Expected 1 or {len(self.battles)} strategies, got {len(strategies)}"
+            )
+
+        playing = [(b, s) for b, s in zip(self.battles, strategies) if not b.is_over]
+        barrier = self._barrier = RoundBarrier(len(playing))
+
+        async def _run(battle, strategy):
+            try:
+                await strategy(battle)
+            finally:
+                barrier.leave()
+
+        tasks = [asyncio.ensure_future(_run(b, s)) for b, s in playing]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other strategies clicking in the background
+            barrier.abort()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            self._barrier = None
+
+        if self._round_start is not None:
+            wall_time = time.monotonic() - self._round_start
+            self._round_times.append(wall_time)
+            self.log(f"Round {self.round_count} played in {wall_time:.2f}s")
+
+    async def sync(self):
+        """
+        Waits for every strategy of the round to reach this point. Only available inside ``play``.
+        """
+        if self._barrier is None:
+            raise RuntimeError(
+                "TeamBattle.sync can only be used inside TeamBattle.play"
+            )
+        await self._barrier.wait()
+
+
+class FollowTheLeader:
+    """
+    Keeps followers next to a leader. The leader's location is read once per tick and compared
+    to the positions of every follower, read together. Only the followers that drifted further
+    than ``threshold`` are moved: they walk to the leader, or are teleported when too far behind.
+
+    Example:
+        .. code-block:: py
+
+            follow = FollowTheLeader(p1, p2, p3, p4)
+            follow.start()
+            # p1 can now walk around, the others stay close
+            await p1.walk_to(XYZYaw(x=-300, y=2800, z=0, yaw=0))
+            await follow.stop()
+    """
+
+    def __init__(
+        self,
+        leader,
+        *followers,
+        threshold: float = FOLLOW_DISTANCE,
+        teleport_distance: float = TELEPORT_DISTANCE,
+        interval: float = FOLLOW_INTERVAL,
+    ):
+        """
+        Args:
+            leader: the ``Client`` to follow
+            followers: the clients following it
+            threshold (float, optional): see ``FOLLOW_DISTANCE``
+            teleport_distance (float, optional): see ``TELEPORT_DISTANCE``. Use 0 to always teleport, None to always walk
+            interval (float, optional): see ``FOLLOW_INTERVAL``
+        """
+        self.leader = leader
+        self.followers = list(followers)
+        self.threshold = threshold
+        self.teleport_distance = teleport_distance
+        self.interval = interval
+
+        self.ticks = 0
+        self.walks = 0
+        self.teleports = 0
+        self._walk_tasks = {}
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        """ True while the background task started with ``start`` is running """
+        return self._task is not None and not self._task.done()
+
+    async def tick(self):
+        """
+        Reads the leader's location once and moves the followers that drifted away
+        """
+        leader_location = await self.leader.get_player_location()
+        followers = [f for f in self.followers if self._same_zone(f)]
+        positions = await asyncio.gather(
+            *[f.walker.body.position() for f in followers], return_exceptions=True
+        )
+
+        moves = []
+        for follower, position in zip(followers, positions):
+            if isinstance(position, Exception):
+                continue
+            drift = math.hypot(
+                leader_location.x - position.x, leader_location.y - position.y
+            )
+            if drift <= self.threshold:
+                continue
+
+            if self.teleport_distance is not None and drift > self.teleport_distance:
+                self._cancel_walk(follower)
+                moves.append(follower.teleport_to(leader_location))
+                self.teleports += 1
+            elif not self._is_walking(follower):
+                self._walk_tasks[follower] = asyncio.create_task(
+                    follower.walk_to(leader_location)
+                )
+                self.walks += 1
+
+        await asyncio.gather(*moves, return_exceptions=True)
+        self.ticks += 1
+
+    async def run(self, duration: float = None):
+        """
+        Calls ``tick`` every ``interval`` seconds for ``duration`` seconds (until cancelled if None)
+        """
+        end = None if duration is None else time.monotonic() + duration
+        with ExitStack() as movements:
+            # The followers are driven for the whole run
+            for follower in self.followers:
+                movements.enter_context(follower.movement())
+            try:
+                while end is None or time.monotonic() < end:
+                    await self.tick()
+                    await asyncio.sleep(self.interval)
+            finally:
+                for follower in list(self._walk_tasks):
+                    self._cancel_walk(follower)
+
+    def start(self):
+        """
+        Runs ``run`` in the background. Must be called from a running event loop.
+        """
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+        return self
+
+    async def stop(self):
+        """
+        Stops the background task started with ``start``
+        """
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def _same_zone(self, follower) -> bool:
+        """ False if the event pollers know the follower is in another zone than the leader """
+        leader_zone, zone = self.leader.events.zone, follower.events.zone
+        return leader_zone is None or zone is None or leader_zone == zone
+
+    def _is_walking(self, follower) -> bool:
+        task = self._walk_tasks.get(follower)
+        return task is not None and not task.done()
+
+    def _cancel_walk(self, follower):
+        task = self._walk_tasks.pop(follower, None)
+        if task is not None:
+            task.cancel()
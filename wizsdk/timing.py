@@ -0,0 +1,333 @@
+# Native imports
+import asyncio
+import json
+import statistics
+import time
+
+# Custom imports
+from .pixels import match_image
+from .utils import packaged_img
+from .ui_state import AREA_FRIENDS_ICON
+
+DEFAULT_TIMINGS = {
+    # Mouse
+    "mouse.click.duration": 0.5,
+    # Cards
+    "card.move": 0.3,
+    "card.hover": 0.1,
+    "card.response": 0.5,
+    "card.enchant_fallback": 0.2,
+    "card.target_fallback": 0.5,
+    # Pass
+    "pass.move": 0.2,
+    "pass.hover": 0.1,
+    "pass.response": 0.9,
+    # Confirm prompt
+    "confirm.appear": 0.2,
+    "confirm.poll": 0.5,
+    "confirm.move": 0.2,
+    "confirm.hover": 0.2,
+    "confirm.response": 0.5,
+    # Dialog
+    "dialog.key": 0.1,
+    "dialog.response": 0.5,
+    # Friend list
+    "friends.toggle": 0.2,
+    "friends.move": 0.2,
+    "friends.page_move": 0.3,
+    "friends.select": 0.5,
+    "friends.teleport": 1.0,
+}
+"""
+Delays (in seconds) used when no timing profile has been calibrated. They are tuned for a slow machine.
+"""
+
+UI_LATENCY_DELAYS = (
+    "card.response",
+    "card.enchant_fallback",
+    "card.target_fallback",
+    "pass.response",
+    "confirm.appear",
+    "confirm.response",
+    "dialog.response",
+    "friends.toggle",
+    "friends.page_move",
+)
+"""
+Delays spent waiting for the UI to respond to a click or a key, scaled by ``calibrate``.
+Mouse moves, hovers, key presses and loading times don't depend on the UI latency and keep their default.
+"""
+
+REFERENCE_LATENCY = 0.25
+""" Click to UI response latency (in seconds) ``DEFAULT_TIMINGS`` were tuned for """
+
+MINIMUM_DELAY = 0.02
+""" Calibrated delays never go below this value """
+
+DEFAULT_PROFILE_FILE = "timing_profile.json"
+""" File ``calibrate`` writes to """
+
+FRIENDS_ICON_RETRIES = 4
+""" Times ``calibrate`` and ``Client.teleport_to_friend`` toggle the friend list looking for its icon before giving up """
+
+# The friend list, once opened
+_AREA_FRIENDS_PANEL = (600, 60, 190, 270)
+
+
+class TimingProfile:
+    """
+    Set of UI delays. Calibrated delays are increased by a safety ``margin`` and
+    never exceed ``DEFAULT_TIMINGS``.
+
+    Example:
+        .. code-block:: py
+
+            # Measure once, on the machine running the bots
+            profile = await wizsdk.timing.calibrate(p1, p2, p3, p4)
+
+            # Next time
+            wizsdk.timing.load_profile("timing_profile.json")
+    """
+
+    def __init__(
+        self,
+        timings: dict = None,
+        margin: float = 0.2,
+        ui_latency: float = None,
+        clients: int = None,
+    ):
+        """
+        Args:
+            timings (dict, optional): calibrated delays, by name. Missing delays use ``DEFAULT_TIMINGS``
+            margin (float, optional): safety margin applied to calibrated delays. Defaults to 0.2 (20%)
+            ui_latency (float, optional): measured click to UI response latency, in seconds
+            clients (int, optional): number of clients running during the calibration
+        """
+        self.timings = dict(timings or {})
+        self.margin = margin
+        self.ui_latency = ui_latency
+        self.clients = clients
+
+    def get(self, name: str) -> float:
+        """
+        Returns the delay ``name`` in seconds
+        """
+        default = DEFAULT_TIMINGS[name]
+        if name not in self.timings:
+            return default
+
+        return min(default, max(MINIMUM_DELAY, self.timings[name] * (1 + self.margin)))
+
+    @classmethod
+    def from_latency(
+        cls, ui_latency: float, margin: float = 0.2, clients: int = None
+    ) -> "TimingProfile":
+        """
+        Scales the ``UI_LATENCY_DELAYS`` of ``DEFAULT_TIMINGS`` by the ratio between a measured UI latency and ``REFERENCE_LATENCY``
+        """
+        ratio = ui_latency / REFERENCE_LATENCY
+        timings = {name: DEFAULT_TIMINGS[name] * ratio for name in UI_LATENCY_DELAYS}
+        return cls(timings, margin=margin, ui_latency=ui_latency, clients=clients)
+
+    def save(self, path: str = DEFAULT_PROFILE_FILE):
+        """
+        Writes the profile to a json file
+        """
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "margin": self.margin,
+                    "ui_latency": self.ui_latency,
+                    "clients": self.clients,
+                    "timings": self.timings,
+                },
+                f,
+                indent=2,
+            )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PROFILE_FILE) -> "TimingProfile":
+        """
+        Reads a profile written by ``save``
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        return cls(
+            data.get("timings"),
+            margin=data.get("margin", 0.2),
+            ui_latency=data.get("ui_latency"),
+            clients=data.get("clients"),
+        )
+
+
+_active_profile = TimingProfile()
+
+
+def active_profile() -> TimingProfile:
+    """
+    Returns the profile used by wizSDK's actions
+    """
+    return _active_profile
+
+
+def set_active_profile(profile: TimingProfile):
+    """
+    Sets the profile used by wizSDK's actions
+    """
+    global _active_profile
+    _active_profile = profile
+
+
+def load_profile(path: str = DEFAULT_PROFILE_FILE) -> TimingProfile:
+    """
+    Loads a profile from a file and makes it the active profile
+    """
+    profile = TimingProfile.load(path)
+    set_active_profile(profile)
+    return profile
+
+
+def get_delay(name: str) -> float:
+    """
+    Returns the delay ``name`` (in seconds) from the active profile
+    """
+    return _active_profile.get(name)
+
+
+async def _measure(client, action, region, timeout):
+    """ Time between ``action`` and the first change of ``region`` """
+    # The cursor is taken before the timer starts, so waiting for it isn't measured
+    async with client.mouse.hold():
+        reference = client.get_image(region)
+        start = time.perf_counter()
+        await action()
+    if await client.wait_for_change(
+        region, timeout, reference=reference, interval=0.01
+    ):
+        return time.perf_counter() - start
+    return None
+
+
+def _locate_friends_icon(client):
+    """ Center of the friend list icon relative to the window, False if it isn't visible (the list is open) """
+    coords = client.coords
+    region = coords.region(AREA_FRIENDS_ICON)
+    found = match_image(
+        client.get_image(region),
+        coords.template(packaged_img("friendlist.png")),
+        threshold=0.05,
+    )
+    if not found:
+        return False
+    return found[0] + region[0], found[1] + region[1]
+
+
+async def _measure_client(client, samples, timeout):
+    """ Opens and closes the friend list with the mouse and the keyboard """
+    latencies = []
+
+    # Make sure the friend list is closed
+    icon = _locate_friends_icon(client)
+    for _ in range(FRIENDS_ICON_RETRIES):
+        if icon:
+            break
+        await client.send_key("F", 0.05)
+        await asyncio.sleep(0.5)
+        icon = _locate_friends_icon(client)
+
+    if not icon:
+        client.log(
+            "Friend list icon not found, skipping the calibration of this client"
+        )
+        return latencies
+
+    x, y = icon
+    panel = client.coords.region(_AREA_FRIENDS_PANEL)
+
+    for _ in range(samples):
+        # Open with a click. The cursor hovers the icon first, so the hover effect isn't measured
+        async with client.mouse.hold():
+            await client.mouse.move_to(x, y, duration=0.2)
+            await asyncio.sleep(0.2)
+            latency = await _measure(
+                client,
+                lambda: client.mouse.click(x, y, duration=0, delay=0),
+                panel,
+                timeout,
+            )
+        if latency is not None:
+            latencies.append(latency)
+        await asyncio.sleep(0.5)
+
+        # Close with the keyboard
+        latency = await _measure(
+            client, lambda: client.send_key("F", 0.05), panel, timeout
+        )
+        if latency is not None:
+            latencies.append(latency)
+        await asyncio.sleep(0.5)
+
+    return latencies
+
+
+async def calibrate(
+    *clients,
+    samples: int = 5,
+    margin: float = 0.2,
+    path: str = DEFAULT_PROFILE_FILE,
+    timeout: float = 2,
+) -> TimingProfile:
+    """
+    Measures the click to UI response latency of the clients by opening and closing their friend list,
+    all clients at the same time so the load matches real use. Clients without silent mouse take turns with the real cursor
+    (see ``CursorLock``). Only the ``UI_LATENCY_DELAYS`` are scaled.
+    Writes the resulting profile to ``path`` and makes it the active profile. The clients must be idle.
+
+    Args:
+        clients: the clients to measure
+        samples (int, optional): number of open / close cycles per client. Defaults to 5
+        margin (float, optional): safety margin applied to the delays. Defaults to 0.2 (20%)
+        path (str, optional): file to write the profile to. Use None to skip writing. Defaults to ``DEFAULT_PROFILE_FILE``
+        timeout (float, optional): time in seconds to wait for the UI to respond. Defaults to 2
+
+    Returns:
+        TimingProfile: the new active profile
+    """
+    # Imported here, the mouse module depends on this one
+    from .mouse import CursorLock
+
+    # Clients moving the real cursor share a lock while they are measured
+    cursor_lock = CursorLock()
+    shared = [
+        client.mouse
+        for client in clients
+        if not client.silent_mouse and client.mouse.cursor_lock is None
+    ]
+    for mouse in shared:
+        mouse.cursor_lock = cursor_lock
+    try:
+        results = await asyncio.gather(
+            *[_measure_client(client, samples, timeout) for client in clients]
+        )
+    finally:
+        for mouse in shared:
+            mouse.cursor_lock = None
+    latencies = sorted(l for client_latencies in results for l in client_latencies)
+
+    if not latencies:
+        print("The UI never responded, keeping the current timing profile")
+        return active_profile()
+
+    # 90th percentile, slow responses matter more than the average
+    ui_latency = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+    print(
+        f"UI latency: median {statistics.median(latencies) * 1000:.0f} ms, "
+        f"p90 {ui_latency * 1000:.0f} ms over {len(latencies)} samples"
+    )
+
+    profile = TimingProfile.from_latency(ui_latency, margin, clients=len(clients))
+    if path:
+        profile.save(path)
+    set_active_profile(profile)
+    return profile
@@ -0,0 +1,260 @@
+# Native imports
+import time
+import asyncio
+
+# Third-party imports
+import numpy as np
+
+# Custom imports
+from .utils import XYZYaw
+
+TRAJECTORY_DTYPE = np.dtype(
+    [("t", "f8"), ("x", "f4"), ("y", "f4"), ("z", "f4"), ("yaw", "f4")]
+)
+""" One sample: time in seconds since the start of the recording, position and yaw """
+
+POSITION_RESOLUTION = 1.0
+""" Positions are rounded to this many game units when compressed """
+
+YAW_RESOLUTION = 1e-4
+""" Yaws are rounded to this many radians when compressed """
+
+TIME_RESOLUTION = 1e-3
+""" Times are rounded to this many seconds when compressed """
+
+
+def _smallest_int(values):
+    """ Casts ``values`` to the smallest signed integer type that holds them """
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if not len(values) or (values.min() >= info.min and values.max() <= info.max):
+            return values.astype(dtype)
+    return values.astype(np.int64)
+
+
+def simplify_indices(points, epsilon: float):
+    """
+    Douglas–Peucker simplification. The distances of a whole segment's points are computed at once.
+
+    Args:
+        points: (N, D) array of positions
+        epsilon (float): largest distance allowed between a dropped point and the simplified path
+
+    Returns:
+        sorted array of the indices of the points to keep, always including the first and the last one
+    """
+    points = np.asarray(points, dtype=np.float64)
+    count = len(points)
+    if count < 3:
+        return np.arange(count)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        a, b = points[start], points[end]
+        inner = points[start + 1 : end]
+        ab = b - a
+        length2 = float(ab @ ab)
+        if length2 == 0:
+            distances = np.linalg.norm(inner - a, axis=1)
+        else:
+            t = np.clip((inner - a) @ ab / length2, 0, 1)
+            distances = np.linalg.norm(inner - (a + t[:, None] * ab), axis=1)
+
+        i = int(np.argmax(distances))
+        if distances[i] > epsilon:
+            split = start + 1 + i
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return np.flatnonzero(keep)
+
+
+class Trajectory:
+    """
+    Recording of the player's position and yaw, stored in a NumPy structured array (``TRAJECTORY_DTYPE``).
+
+    Recordings are saved as ``.npy`` files that can be memory-mapped, or compressed to quantized deltas in a ``.npz`` file.
+
+    Example:
+        .. code-block:: py
+
+            trajectory = Trajectory()
+            await trajectory.record(player, duration=60)
+            trajectory.save("route.npy")
+
+            # Later
+            trajectory = Trajectory.load("route.npy")
+            await trajectory.replay(player, epsilon=20)
+    """
+
+    def __init__(self, samples=None, capacity: int = 1024):
+        """
+        Args:
+            samples (optional): existing array of ``TRAJECTORY_DTYPE``
+            capacity (int, optional): number of samples allocated up front. Defaults to 1024
+        """
+        if samples is None:
+            self._samples = np.zeros(capacity, dtype=TRAJECTORY_DTYPE)
+            self._count = 0
+        else:
+            self._samples = samples
+            self._count = len(samples)
+        self._start = None
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def samples(self):
+        """
+        The recorded samples, as a structured array view
+        """
+        return self._samples[: self._count]
+
+    @property
+    def positions(self):
+        """
+        (N, 3) float array of the recorded positions
+        """
+        samples = self.samples
+        return np.stack([samples["x"], samples["y"], samples["z"]], axis=1)
+
+    def append(self, location: XYZYaw, t: float = None):
+        """
+        Adds a sample. ``t`` defaults to the time since the first sample
+        """
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        if t is None:
+            t = now - self._start
+
+        if self._count == len(self._samples):
+            # Read-only (memory-mapped) or full: grow into a new array
+            grown = np.zeros(max(1024, 2 * self._count), dtype=TRAJECTORY_DTYPE)
+            grown[: self._count] = self._samples[: self._count]
+            self._samples = grown
+
+        self._samples[self._count] = (
+            t,
+            location.x,
+            location.y,
+            location.z,
+            location.yaw,
+        )
+        self._count += 1
+
+    async def record(self, client, duration: float = None, interval: float = 0.2):
+        """
+        Samples the player's location every ``interval`` seconds for ``duration`` seconds (until cancelled if None)
+        """
+        end = None if duration is None else time.monotonic() + duration
+        while end is None or time.monotonic() < end:
+            self.append(await client.get_player_location())
+            await asyncio.sleep(interval)
+
+    def simplify(self, epsilon: float = 10.0) -> "Trajectory":
+        """
+        Drops the samples that are within ``epsilon`` game units of the path of the others (Douglas–Peucker)
+
+        Returns:
+            Trajectory: a new, simplified trajectory
+        """
+        indices = simplify_indices(self.positions, epsilon)
+        return Trajectory(self.samples[indices].copy())
+
+    def locations(self) -> list:
+        """
+        Returns:
+            list of ``XYZYaw`` of the samples
+        """
+        return [XYZYaw(x, y, z, yaw) for _, x, y, z, yaw in self.samples.tolist()]
+
+    async def replay(self, client, epsilon: float = 10.0):
+        """
+        Walks through the simplified trajectory with ``Client.walk_to``
+
+        Args:
+            client: the ``Client`` to move
+            epsilon (float, optional): see ``simplify``. Use 0 to walk through every sample. Defaults to 10
+        """
+        trajectory = self.simplify(epsilon) if epsilon else self
+        for location in trajectory.locations():
+            await client.walk_to(location)
+
+    def save(self, path: str):
+        """
+        Writes the samples to a ``.npy`` file
+        """
+        np.save(path, self.samples)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "Trajectory":
+        """
+        Reads a file written by ``save``. With ``mmap``, the samples are memory-mapped instead of read in memory.
+        """
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+    def compress(self) -> dict:
+        """
+        Quantizes the samples (see ``POSITION_RESOLUTION``, ``YAW_RESOLUTION`` and ``TIME_RESOLUTION``)
+        and stores the difference between consecutive samples, in the smallest integer type that fits.
+
+        Returns:
+            dict of the first sample and the deltas of every field
+        """
+        samples = self.samples
+        resolutions = {
+            "t": TIME_RESOLUTION,
+            "x": POSITION_RESOLUTION,
+            "y": POSITION_RESOLUTION,
+            "z": POSITION_RESOLUTION,
+            "yaw": YAW_RESOLUTION,
+        }
+        data = {}
+        for field, resolution in resolutions.items():
+            quantized = np.round(samples[field].astype(np.float64) / resolution)
+            quantized = quantized.astype(np.int64)
+            data[f"{field}_first"] = quantized[:1]
+            data[f"{field}_delta"] = _smallest_int(np.diff(quantized))
+            data[f"{field}_resolution"] = np.array(resolution)
+        return data
+
+    @classmethod
+    def decompress(cls, data) -> "Trajectory":
+        """
+        Rebuilds a trajectory from the output of ``compress``
+        """
+        first = data["t_first"]
+        samples = np.zeros(len(first) + len(data["t_delta"]), dtype=TRAJECTORY_DTYPE)
+        if not len(first):
+            return cls(samples)
+
+        for field in TRAJECTORY_DTYPE.names:
+            quantized = np.concatenate(
+                [data[f"{field}_first"], data[f"{field}_delta"].astype(np.int64)]
+            ).cumsum()
+            samples[field] = quantized * float(data[f"{field}_resolution"])
+        return cls(samples)
+
+    def save_compressed(self, path: str):
+        """
+        Writes the output of ``compress`` to a ``.npz`` file
+        """
+        np.savez_compressed(path, **self.compress())
+
+    @classmethod
+    def load_compressed(cls, path: str) -> "Trajectory":
+        """
+        Reads a file written by ``save_compressed``
+        """
+        with np.load(path) as data:
+            return cls.decompress(data)
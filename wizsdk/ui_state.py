@@ -0,0 +1,288 @@
+# Third-party imports
+import numpy as np
+
+# Custom imports
+from .pixels import match_image, image_pixel_matches_color, crop
+from .utils import packaged_img
+
+# rectangles defined as (x, y, width, height)
+AREA_CONFIRM = (355, 370, 100, 70)
+AREA_SPELLBOOK = (725, 555, 60, 60)
+AREA_PRESS_X = (350, 540, 100, 20)
+# Friend list icon, visible when the list is closed
+AREA_FRIENDS_ICON = (775, 30, 40, 40)
+
+
+class PixelProbe:
+    """
+    Detects a pixel of the expected color
+    """
+
+    def __init__(self, xy: tuple, rgb: tuple, tolerance: int = 0):
+        """
+        Args:
+            xy: (x, y) position of the pixel relative to the window
+            rgb: (r, g, b) expected color
+            tolerance: difference allowed on each channel
+        """
+        self.xy = xy
+        self.rgb = rgb
+        self.tolerance = tolerance
+
+    def matches(self, image, coords=None) -> bool:
+        """
+        Evaluates the detector on a capture of the whole window
+
+        Args:
+            image: the capture
+            coords (optional): ``CoordinateSpace`` of the captured window. Defaults to an 800x600 client
+        """
+        xy = self.xy if coords is None else coords.point(*self.xy)
+        return image_pixel_matches_color(image, xy, self.rgb, self.tolerance)
+
+    def check(self, device_context) -> bool:
+        """ Evaluates the detector on the live window """
+        return device_context.pixel_matches_color(
+            device_context.coords.point(*self.xy), self.rgb, self.tolerance
+        )
+
+    def __repr__(self):
+        return f"PixelProbe({self.xy}, {self.rgb}, {self.tolerance})"
+
+
+class TemplateInRegion:
+    """
+    Detects an image inside a region of the window
+    """
+
+    def __init__(
+        self, template, region: tuple, threshold: float = 0.1, scale: float = 1
+    ):
+        """
+        Args:
+            template: file name or numpy array of the image to find
+            region: (x, y, width, height) area to look in
+            threshold: precision of the match -- between 0 and 1, the lowest being more precise
+            scale: ``check`` and ``locate_on`` capture the region downsampled to this scale (0.5 for example)
+                and match a template downsampled the same way. Good enough for coarse detectors. Defaults to 1
+        """
+        self.template = template
+        self.region = region
+        self.threshold = threshold
+        self.scale = scale
+
+    def locate(self, image, coords=None):
+        """
+        Returns the (x, y) center of the match relative to the window in a capture of the whole window, False if not found.
+        With ``coords``, the region and the template are scaled to the client size, and the result is in canonical coordinates.
+
+        Args:
+            image: the capture
+            coords (optional): ``CoordinateSpace`` of the captured window. Defaults to an 800x600 client
+        """
+        if coords is None or coords.is_identity:
+            return self._locate_in_region(crop(image, self.region))
+
+        region = coords.region(self.region)
+        found = match_image(
+            crop(image, region),
+            coords.template(self.template),
+            threshold=self.threshold,
+        )
+        if not found:
+            return False
+        return coords.to_canonical(found[0] + region[0], found[1] + region[1])
+
+    def locate_on(self, device_context):
+        """
+        Returns the (x, y) center of the match relative to the window, captured from the live window. False if not found.
+        The region and the template are scaled to the client size, and the result is in canonical coordinates.
+        """
+        coords = device_context.coords
+        region = coords.region(self.region)
+        found = match_image(
+            device_context.get_image(region, scale=self.scale),
+            coords.template(self.template, self.scale),
+            threshold=self.threshold,
+        )
+        if not found:
+            return False
+        x, y = found[0] / self.scale, found[1] / self.scale
+        return coords.to_canonical(round(x) + region[0], round(y) + region[1])
+
+    def matches(self, image, coords=None) -> bool:
+        """ Evaluates the detector on a capture of the whole window. See ``locate`` """
+        return bool(self.locate(image, coords))
+
+    def check(self, device_context) -> bool:
+        """ Evaluates the detector on the live window """
+        return bool(self.locate_on(device_context))
+
+    def _locate_in_region(self, region_image):
+        found = match_image(region_image, self.template, threshold=self.threshold)
+        if not found:
+            return False
+        return found[0] + self.region[0], found[1] + self.region[1]
+
+    def __repr__(self):
+        return f"TemplateInRegion({self.template!r}, {self.region}, {self.threshold})"
+
+
+class ColorMask:
+    """
+    Detects a region where enough pixels are within a color range
+    """
+
+    def __init__(
+        self, region: tuple, lower_rgb: tuple, upper_rgb: tuple, fraction: float = 0.5
+    ):
+        """
+        Args:
+            region: (x, y, width, height) area to test
+            lower_rgb: (r, g, b) lowest value of each channel
+            upper_rgb: (r, g, b) highest value of each channel
+            fraction: part of the region (between 0 and 1) that must be within the range
+        """
+        self.region = region
+        # Captures are stored as (blue, green, red)
+        self.lower = np.array(lower_rgb[::-1], dtype=np.uint8)
+        self.upper = np.array(upper_rgb[::-1], dtype=np.uint8)
+        self.fraction = fraction
+
+    def _test(self, region_image) -> bool:
+        if region_image.size == 0:
+            return False
+        in_range = np.all(
+            (region_image >= self.lower) & (region_image <= self.upper), axis=2
+        )
+        return bool(in_range.mean() >= self.fraction)
+
+    def matches(self, image, coords=None) -> bool:
+        """
+        Evaluates the detector on a capture of the whole window
+
+        Args:
+            image: the capture
+            coords (optional): ``CoordinateSpace`` of the captured window. Defaults to an 800x600 client
+        """
+        region = self.region if coords is None else coords.region(self.region)
+        return self._test(crop(image, region))
+
+    def check(self, device_context) -> bool:
+        """ Evaluates the detector on the live window """
+        return self._test(
+            device_context.get_image(device_context.coords.region(self.region))
+        )
+
+
+class AllOf:
+    """
+    Detects when all of its detectors match
+    """
+
+    def __init__(self, *detectors):
+        self.detectors = detectors
+
+    def matches(self, image, coords=None) -> bool:
+        return all(d.matches(image, coords) for d in self.detectors)
+
+    def check(self, device_context) -> bool:
+        return all(d.check(device_context) for d in self.detectors)
+
+
+class Not:
+    """
+    Detects when its detector doesn't match
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def matches(self, image, coords=None) -> bool:
+        return not self.detector.matches(image, coords)
+
+    def check(self, device_context) -> bool:
+        return not self.detector.check(device_context)
+
+
+UI_DETECTORS = {
+    # Red pixel in the "close" icon
+    "crown_shop": PixelProbe((788, 53), (197, 40, 41), 50),
+    # Spellbook icon, visible out of loading and out of battle
+    "idle": TemplateInRegion(packaged_img("spellbook.png"), AREA_SPELLBOOK, 0.05),
+    # "more" or "done" button of NPC dialogs
+    "dialog_more": AllOf(
+        PixelProbe((674, 621), (110, 30, 53), 15),
+        PixelProbe((592, 613), (111, 31, 52), 15),
+    ),
+    "press_x": TemplateInRegion(packaged_img("x.png"), AREA_PRESS_X, 0.1),
+    "confirm": TemplateInRegion(packaged_img("confirm.png"), AREA_CONFIRM, 0.2),
+    # Red pixel in the lower third of the health globe
+    "health_low": Not(PixelProbe((23, 563), (126, 41, 3), 15)),
+    # Blue pixel in the lower third of the mana globe
+    "mana_low": Not(PixelProbe((79, 591), (66, 13, 83), 15)),
+}
+"""
+Detectors evaluated by ``Client.ui_state``, by name. Add detectors with ``register_detector``.
+"""
+
+
+def register_detector(name: str, detector):
+    """
+    Adds a detector to ``UI_DETECTORS``
+
+    Args:
+        name (str): name of the flag in ``UIState``
+        detector: any object with a ``matches(image, coords=None)`` and a ``check(device_context)`` method
+    """
+    UI_DETECTORS[name] = detector
+
+
+class UIState:
+    """
+    Flags of the detectors in ``UI_DETECTORS`` that matched a capture.
+
+    Example:
+        .. code-block:: py
+
+            state = player.ui_state()
+            if state.dialog_more or state.press_x:
+                await player.go_through_dialog()
+            print(state) # -> UIState(idle, health_low)
+    """
+
+    __slots__ = ("flags", "image")
+
+    def __init__(self, flags: frozenset, image=None):
+        self.flags = flags
+        self.image = image
+
+    @classmethod
+    def evaluate(cls, image, detectors: dict = None, coords=None) -> "UIState":
+        """
+        Evaluates every detector on a single capture of the whole window
+
+        Args:
+            image: the capture
+            detectors (dict, optional): detectors by name. Defaults to ``UI_DETECTORS``
+            coords (optional): ``CoordinateSpace`` of the captured window. Defaults to an 800x600 client
+        """
+        if detectors is None:
+            detectors = UI_DETECTORS
+        flags = frozenset(
+            name
+            for name, detector in detectors.items()
+            if detector.matches(image, coords)
+        )
+        return cls(flags, image)
+
+    def __getattr__(self, name):
+        if name in UI_DETECTORS:
+            return name in self.flags
+        raise AttributeError(f"No detector named {name}")
+
+    def __contains__(self, name):
+        return name in self.flags
+
+    def __repr__(self):
+        return f"UIState({', '.join(sorted(self.flags))})"
@@ -93,11 +93,22 @@ def count_wiz_clients() -> int:
     return len(get_all_wiz_handles())
 
 
-async def finish_all_loading(*players):
+async def finish_all_loading(*players, start_timeout=3, timeout=60):
     """
     Wait for all players passed in as arguments to have gone through the loading screen.
+    All the players are watched by a single polling loop.
+
+    Args:
+        start_timeout (optional): value in seconds after which a player is considered already loaded if no loading screen showed up. None to wait for a loading screen until ``timeout``. Defaults to 3
+        timeout (optional): value in seconds after which the players still loading are given up on. Defaults to 60
+
+    Returns:
+        dict of player -> time in seconds spent loading, None for players that never showed a loading screen. Players still loading after ``timeout`` are left out
     """
-    await asyncio.gather(*[player.finish_loading() for player in players])
+    # Imported here, the loading module depends on this one
+    from .loading import wait_loaded
+
+    return await wait_loaded(*players, start_timeout=start_timeout, timeout=timeout)
 
 
 def packaged_img(filename: str = ""):
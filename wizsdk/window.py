@@ -1,18 +1,108 @@
 import ctypes
+import ctypes.wintypes
+import time
+from collections import Counter
 from ctypes import WinDLL
 
 user32 = ctypes.WinDLL("user32.dll")
 
+RECT_CACHE_TTL = 1.0
+""" Seconds a window's rectangle is cached for before ``GetWindowRect`` is called again """
+
+SCREEN_SIZE_TTL = 5.0
+""" Seconds the screen size is cached for before ``GetSystemMetrics`` is called again """
+
+call_counts = Counter()
+"""
+Number of calls made to the user32 geometry functions (``GetWindowRect``, ``GetClientRect``, ``GetSystemMetrics``).
+Useful to check the effect of the geometry cache.
+
+:meta private:
+"""
+
+# window handle -> (time read, (x, y, width, height))
+_rect_cache = {}
+# window handle -> (time read, (x, y, width, height)) of the client area, relative to the window
+_client_area_cache = {}
+# (expiry time, (width, height))
+_screen_size_cache = None
+
+
+def reset_call_counts():
+    """
+    Resets the ``call_counts`` counter
+    """
+    call_counts.clear()
+
 
 def screen_size():
     """Returns the width and height of the screen as a two-integer tuple.
+    The value is cached for ``SCREEN_SIZE_TTL`` seconds, call ``invalidate_screen_size`` after changing the display settings.
+
     Returns:
       (width, height) tuple of the screen size, in pixels.
     """
-    return (
-        ctypes.windll.user32.GetSystemMetrics(0),
-        ctypes.windll.user32.GetSystemMetrics(1),
-    )
+    global _screen_size_cache
+    now = time.monotonic()
+
+    if _screen_size_cache is None or _screen_size_cache[0] <= now:
+        call_counts["GetSystemMetrics"] += 2
+        size = (user32.GetSystemMetrics(0), user32.GetSystemMetrics(1))
+        _screen_size_cache = (now + SCREEN_SIZE_TTL, size)
+
+    return _screen_size_cache[1]
+
+
+def invalidate_screen_size():
+    """
+    Forces the next ``screen_size`` call to read the screen size again
+    """
+    global _screen_size_cache
+    _screen_size_cache = None
+
+
+def invalidate_geometry():
+    """
+    Clears the cached rectangles of every window and the cached screen size
+    """
+    _rect_cache.clear()
+    _client_area_cache.clear()
+    invalidate_screen_size()
+
+
+def tile_windows(*windows, columns: int = None, origin: tuple = (0, 0)) -> list:
+    """
+    Moves windows into a grid where they don't overlap, left to right then top to bottom, in the order given.
+    Windows keep their size. Their cached rectangles are invalidated.
+
+    Args:
+        windows: the windows (``Client`` for example) to move
+        columns (int, optional): number of windows per row. Defaults to as many as fit on the screen
+        origin (tuple, optional): (x, y) position of the top left window on the screen. Defaults to (0, 0)
+
+    Returns:
+        list of the (x, y, width, height) rectangles the windows were moved to
+    """
+    if not windows:
+        return []
+
+    sizes = [w.get_rect()[2:] for w in windows]
+    cell_w = max(w for w, _ in sizes)
+    cell_h = max(h for _, h in sizes)
+
+    if columns is None:
+        screen_w, _ = screen_size()
+        columns = max(1, min(len(windows), (screen_w - origin[0]) // cell_w))
+
+    rects = []
+    for i, (window, (w, h)) in enumerate(zip(windows, sizes)):
+        x = origin[0] + (i % columns) * cell_w
+        y = origin[1] + (i // columns) * cell_h
+        user32.MoveWindow(window.window_handle, x, y, w, h, True)
+        window.invalidate_rect()
+        rects.append((x, y, w, h))
+
+    return rects
 
 
 class Window:
@@ -38,18 +128,83 @@ class Window:
             user32.SetForegroundWindow(self.window_handle)
         return self
 
-    def get_rect(self) -> tuple:
+    def get_rect(self, max_age: float = None) -> tuple:
         """
         Gets the area rectangle of the window (x, y, width, height) relative to the monitor position.
-        
-        Returns: 
+        The rectangle is cached per window for ``RECT_CACHE_TTL`` seconds. Call ``invalidate_rect`` after moving the window.
+
+        Args:
+            max_age (float, optional): how old the cached rectangle can be, in seconds. Defaults to ``RECT_CACHE_TTL``
+
+        Returns:
             tuple (x, y, width, height) of the window
         """
         if self.window_handle:
+            if max_age is None:
+                max_age = RECT_CACHE_TTL
+
+            now = time.monotonic()
+            cached = _rect_cache.get(self.window_handle)
+            if cached and now - cached[0] <= max_age:
+                return cached[1]
+
             rect = ctypes.wintypes.RECT()
+            call_counts["GetWindowRect"] += 1
             user32.GetWindowRect(self.window_handle, ctypes.byref(rect))
             # Returns (x, y, w, h) tuple
-            return (rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top)
+            window_rect = (
+                rect.left,
+                rect.top,
+                rect.right - rect.left,
+                rect.bottom - rect.top,
+            )
+            _rect_cache[self.window_handle] = (now, window_rect)
+            return window_rect
         else:
             # Return rect of screen
             return (0, 0, *screen_size())
+
+    def get_client_area(self, max_age: float = None) -> tuple:
+        """
+        Gets the client area of the window (the game, without the title bar and borders),
+        relative to the window. Cached like ``get_rect``.
+
+        Args:
+            max_age (float, optional): how old the cached area can be, in seconds. Defaults to ``RECT_CACHE_TTL``
+
+        Returns:
+            tuple (x, y, width, height) of the client area
+        """
+        if not self.window_handle:
+            return (0, 0, *screen_size())
+
+        if max_age is None:
+            max_age = RECT_CACHE_TTL
+
+        now = time.monotonic()
+        cached = _client_area_cache.get(self.window_handle)
+        if cached and now - cached[0] <= max_age:
+            return cached[1]
+
+        rect = ctypes.wintypes.RECT()
+        origin = ctypes.wintypes.POINT(0, 0)
+        call_counts["GetClientRect"] += 1
+        user32.GetClientRect(self.window_handle, ctypes.byref(rect))
+        user32.ClientToScreen(self.window_handle, ctypes.byref(origin))
+
+        window_x, window_y, _, _ = self.get_rect(max_age)
+        client_area = (
+            origin.x - window_x,
+            origin.y - window_y,
+            rect.right - rect.left,
+            rect.bottom - rect.top,
+        )
+        _client_area_cache[self.window_handle] = (now, client_area)
+        return client_area
+
+    def invalidate_rect(self):
+        """
+        Forces the next ``get_rect`` call to read the window's rectangle again
+        """
+        _rect_cache.pop(self.window_handle, None)
+        _client_area_cache.pop(self.window_handle, None)